@@ -0,0 +1,37 @@
+"""
+Benchmark MemoryResource put and get on a full cache of 1M items, with expiry set.
+
+Usage: poetry run python benchmarks/memory_eviction.py [policy ...]
+"""
+
+import asyncio
+import sys
+import time
+
+from fondat.memory import MemoryResource
+
+
+ITEMS = 1_000_000
+CALLS = 2000
+
+
+async def main(policy: str):
+    resource = MemoryResource(
+        key_type=str, value_type=int, size=ITEMS, evict=True, expire=3600, policy=policy
+    )
+    for n in range(ITEMS):  # fill directly, bypassing operation overhead
+        resource._write(str(n), n)
+    start = time.perf_counter()
+    for n in range(CALLS):
+        await resource[str(ITEMS + n)].put(n)
+    put = (time.perf_counter() - start) / CALLS * 1e6
+    start = time.perf_counter()
+    for n in range(CALLS):
+        await resource[str(ITEMS + n)].get()
+    get = (time.perf_counter() - start) / CALLS * 1e6
+    print(f"{policy}: put (full, evicting) {put:.1f} µs, get {get:.1f} µs")
+
+
+if __name__ == "__main__":
+    for policy in sys.argv[1:] or ("oldest", "lru", "lfu"):
+        asyncio.run(main(policy))
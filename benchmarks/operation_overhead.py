@@ -0,0 +1,46 @@
+"""
+Benchmark the per-call overhead of the operation wrapper, comparing a trivial query
+operation with a bare coroutine.
+
+Usage: poetry run python benchmarks/operation_overhead.py
+"""
+
+import asyncio
+import time
+
+from fondat.resource import query, resource
+
+
+CALLS = 50000
+WARMUP = 1000
+
+
+@resource
+class Resource:
+    @query
+    async def get(self, x: int = 0) -> int:
+        return x
+
+
+async def bare(x: int = 0) -> int:
+    return x
+
+
+async def measure(call) -> float:
+    """Return the mean time of a call in microseconds."""
+    for _ in range(WARMUP):
+        await call()
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        await call()
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+
+async def main():
+    resource = Resource()
+    print(f"bare coroutine: {await measure(lambda: bare(1)):.2f} µs/call")
+    print(f"query operation: {await measure(lambda: resource.get(1)):.2f} µs/call")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+"""
+Benchmark SharedMemoryCache throughput with 1 and 4 processes sharing a cache, with a
+workload of 90% get and 10% put.
+
+Usage: poetry run python benchmarks/shm_processes.py
+"""
+
+import asyncio
+import multiprocessing
+import tempfile
+import time
+
+from fondat.error import NotFoundError
+from fondat.shm import SharedMemoryCache
+
+
+OPERATIONS = 20000  # per process
+KEYS = 5000
+
+
+def work(path: str) -> float:
+    async def run():
+        cache = SharedMemoryCache(path, slots=65536, slot_size=512)
+        value = {"result": list(range(20)), "time": 1.0}
+        start = time.perf_counter()
+        for n in range(OPERATIONS):
+            entry = cache[n % KEYS]
+            if n % 10 == 0:
+                await entry.put(value)
+            try:
+                await entry.get()
+            except NotFoundError:
+                pass
+        return time.perf_counter() - start
+
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as dir:
+        for processes in (1, 4):
+            with multiprocessing.get_context("fork").Pool(processes) as pool:
+                elapsed = max(pool.map(work, [f"{dir}/cache"] * processes))
+            throughput = OPERATIONS * processes / elapsed
+            print(
+                f"{processes} process(es): {throughput / 1000:.0f}k ops/s aggregate, "
+                f"{elapsed / OPERATIONS * 1e6:.1f} µs/op"
+            )
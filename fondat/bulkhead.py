@@ -0,0 +1,65 @@
+"""Module to limit the concurrent execution of work."""
+
+import asyncio
+
+from fondat.error import errors
+from fondat.validation import MinValue, validate_arguments
+from typing import Annotated
+
+
+class Bulkhead:
+    """
+    Limits the number of concurrent executions of work, rejecting work that cannot be
+    executed promptly.
+
+    Parameters and attributes:
+    • limit: maximum number of concurrent executions
+    • queue: maximum number of executions waiting to start  [unlimited]
+    • timeout: maximum time in seconds to wait for execution to start  [unlimited]
+
+    A bulkhead is an asynchronous context manager; work is executed within its context. If
+    the limit of concurrent executions is reached, work waits to start. If the queue of
+    waiting work is full, or if the timeout elapses while waiting, ServiceUnavailableError is
+    raised.
+
+    A bulkhead can be shared by multiple operations to limit their combined concurrency.
+
+    Attributes:
+    • active: number of executions in progress
+    • waiting: number of executions waiting to start
+    """
+
+    @validate_arguments
+    def __init__(
+        self,
+        limit: Annotated[int, MinValue(1)],
+        queue: Annotated[int, MinValue(0)] | None = None,
+        timeout: int | float | None = None,
+    ):
+        self.limit = limit
+        self.queue = queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def __aenter__(self):
+        if self._semaphore.locked():
+            if self.queue is not None and self.waiting >= self.queue:
+                raise errors.ServiceUnavailableError("bulkhead queue is full")
+            self.waiting += 1
+            try:
+                async with asyncio.timeout(self.timeout):
+                    await self._semaphore.acquire()
+            except TimeoutError as te:
+                raise errors.ServiceUnavailableError("bulkhead wait timed out") from te
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        self.active += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        self.active -= 1
+        self._semaphore.release()
@@ -1,8 +1,17 @@
-"""Fondat cache module."""
+"""
+Fondat cache module.
+
+A global "tags" object tracks invalidations of cache tags, which are used to invalidate cached
+values by tag. Applications are free to configure it to store tag invalidations in a cache
+resource shared between processes.
+"""
 
 import hashlib
 import json
+import time
 
+from collections.abc import Iterable, Mapping
+from fondat.error import NotFoundError
 from typing import Any, Protocol, runtime_checkable
 
 
@@ -39,3 +48,80 @@ def hash_json(value: JSON) -> bytes:
     return hashlib.sha256(
         json.dumps(value, separators=(",", ":"), sort_keys=True).encode()
     ).digest()
+
+
+def hash_key(key: JSON | bytes) -> bytes:
+    """
+    Return a deterministic, unique hash value for a cache entry key, which is either a JSON
+    object model value or bytes.
+    """
+    if isinstance(key, bytes | bytearray):
+        return hashlib.sha256(key).digest()
+    return hash_json(key)
+
+
+class Tags:
+    """
+    Tracks invalidations of cache tags, to invalidate cached values by tag.
+
+    Parameters and attributes:
+    • cache: resource to store tag invalidation times  [process memory]
+    • size: number of slots to store tag invalidation times in process memory
+
+    A cached value records the time its tags were read when it is stored. Invalidating a tag
+    records the time of invalidation; a value that recorded its tags at or before the
+    invalidation of any of its tags is stale. Only invalidated tags are tracked, so tags that
+    were never invalidated do not consume storage, and values cached in a persistent cache
+    resource remain valid across restarts. Storing invalidation times in a shared cache
+    resource allows invalidation to span processes, and to survive restarts; processes
+    sharing a cache resource are expected to have synchronized clocks.
+
+    In process memory, invalidation times are stored in a fixed number of slots, indexed by
+    tag hash; a slot retains the latest invalidation time of the tags that share it, so
+    invalidating a tag can make values tagged with another tag in the same slot stale. A
+    cache resource that stores invalidation times should retain them at least as long as the
+    values tagged with them are cached.
+    """
+
+    def __init__(self, cache: CacheResource | None = None, size: int = 100000):
+        self.cache = cache
+        self.size = size
+        self._invalidated: dict[int, int] = {}  # slot: time
+        self._last = 0  # last time issued
+
+    def _now(self) -> int:
+        """Return the time in nanoseconds, strictly later than any time previously issued."""
+        self._last = max(time.time_ns(), self._last + 1)
+        return self._last
+
+    async def _get(self, tag: str) -> int:
+        if self.cache is None:
+            return self._invalidated.get(hash(tag) % self.size, 0)
+        try:
+            return int(await self.cache[{"tag": tag}].get())
+        except NotFoundError:
+            return 0
+
+    async def versions(self, tags: Iterable[str]) -> dict[str, int]:
+        """Return the versions of the specified tags, to be recorded with a cached value."""
+        now = self._now()
+        return {tag: now for tag in tags}
+
+    async def valid(self, versions: Mapping[str, int]) -> bool:
+        """Return if recorded tag versions are all current."""
+        for tag, version in versions.items():
+            if not isinstance(version, int) or await self._get(tag) >= version:
+                return False  # invalidated, or recorded in a previous format
+        return True
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        """Invalidate all cached values that are tagged with any of the specified tags."""
+        now = self._now()
+        for tag in tags:
+            if self.cache is not None:
+                await self.cache[{"tag": tag}].put(str(now))
+                continue
+            self._invalidated[hash(tag) % self.size] = now
+
+
+tags = Tags()
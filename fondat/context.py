@@ -12,8 +12,10 @@ maintained for different threads and asynchrous tasks.
 
 import contextvars
 import datetime
+import time
 import uuid
 
+from collections.abc import Callable, Iterable, Mapping
 from typing import Any, Generator
 
 
@@ -32,17 +34,41 @@ class _Element:
     with its value, then the previously pushed element's value below it, and so on. In this
     manner, the element at the top of a stack represents the entire stack.
 
+    Each element also indexes the stack by "context" value: the most and least recently
+    pushed elements for each context value, and the previously pushed element with the same
+    context value as its own. Indexes are built when an element is pushed, and are shared with
+    the element below it where unchanged; they allow elements to be found by context value
+    without walking the entire stack.
+
     Parameters:
     • value: the value this stack element contains
     • prev: the element below this elemment on the stack, or None if this is the first element
     """
 
-    __slots__ = {"_value", "_prev", "_len"}
+    __slots__ = {"_value", "_prev", "_len", "_last", "_first", "_prev_same"}
 
     def __init__(self, value, prev=None):
         self._value = value
         self._prev = prev
         self._len = prev._len + 1 if prev else 1
+        context = value.get("context")
+        last = prev._last if prev else {}
+        try:
+            self._prev_same = last.get(context)
+        except TypeError:  # unhashable context value; not indexed
+            self._prev_same = None
+            self._last = last
+            self._first = prev._first if prev else last
+            return
+        if prev is None:
+            self._last = self._first = {context: self}
+            return
+        self._last = last.copy()
+        self._last[context] = self
+        self._first = prev._first
+        if self._prev_same is None:
+            self._first = self._first.copy()
+            self._first[context] = self
 
     def __iter__(self):
         class _iter:
@@ -67,6 +93,48 @@ class _Element:
         return self._len
 
 
+class _Root(Mapping):
+    """
+    The value of the root element of a context stack. The unique identifier and timestamp are
+    generated when first read, as most stacks are discarded without them ever being read; the
+    time of creation is captured eagerly.
+    """
+
+    __slots__ = {"_time", "_id", "_datetime"}
+
+    _keys = ("context", "id", "time")
+
+    def __init__(self):
+        self._time = time.time()
+        self._id = None
+        self._datetime = None
+
+    def __getitem__(self, key):
+        match key:
+            case "context":
+                return "fondat.root"
+            case "id":
+                if self._id is None:
+                    self._id = uuid.uuid4()
+                return self._id
+            case "time":
+                if self._datetime is None:
+                    self._datetime = datetime.datetime.fromtimestamp(
+                        self._time, tz=datetime.timezone.utc
+                    )
+                return self._datetime
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
 class StackContextManager:
     """
     A context manager returned from pushing a value on the context stack, to automatically pop
@@ -113,17 +181,45 @@ def push(*args, **kwargs) -> StackContextManager:
     value = dict(*args, **kwargs)
     if "context" not in value:
         raise ValueError('pushed context must have a "context" item')
-    stack = _stack.get(None)
-    if not stack:
-        stack = _Element(
-            dict(
-                context="fondat.root",
-                id=uuid.uuid4(),
-                time=datetime.datetime.now(tz=datetime.timezone.utc),
-            )
-        )
-    token = _stack.set(_Element(value, stack))
-    return StackContextManager(token)
+    return _push(value)
+
+
+def _push(value: dict[str, Any]) -> StackContextManager:
+    """
+    Push a value onto the execution context stack without copying it. The caller must supply
+    a new dictionary containing a "context" item, and must not modify it after it is pushed.
+    """
+    stack = _stack.get(None) or _Element(_Root())
+    return StackContextManager(_stack.set(_Element(value, stack)))
+
+
+def snapshot(select: Callable[[Mapping[str, Any]], bool] | None = None) -> list[Any]:
+    """
+    Return a snapshot of the values on the execution context stack, ordered from least to
+    most recently pushed. The snapshot can be restored in another thread or process.
+
+    Parameters:
+    • select: function that returns whether a value is included in the snapshot  [all]
+
+    Values must be selected with care; omitting values that authorization rules or other
+    consumers of the stack depend upon can change their behavior.
+    """
+    values = list(_stack.get(()))[::-1]
+    return values if select is None else [value for value in values if select(value)]
+
+
+def restore(snapshot: Iterable[Any]) -> StackContextManager:
+    """
+    Replace the execution context stack with values from a snapshot, and return a context
+    manager that will restore the previous stack upon exit.
+
+    Parameters:
+    • snapshot: values to restore, ordered from least to most recently pushed
+    """
+    stack = None
+    for value in snapshot:
+        stack = _Element(value, stack)
+    return StackContextManager(_stack.set(stack))
 
 
 def find(*args, **kwargs) -> Generator[Any, None, None]:
@@ -138,8 +234,35 @@ def find(*args, **kwargs) -> Generator[Any, None, None]:
 
     Supplying no parameters will yield all elements on the stack.
     """
-    test = dict(*args, **kwargs).items() or None
-    return (value for value in _stack.get(()) if test is None or test <= value.items())
+    match = dict(*args, **kwargs)
+    stack = _stack.get(None)
+    if (same := _same(stack, match)) is not _UNINDEXED:
+        return _find_same(same, match.items())
+    test = match.items() or None
+    return (value for value in stack or () if test is None or test <= value.items())
+
+
+_UNINDEXED = object()
+
+
+def _same(stack: _Element | None, match: dict[str, Any]) -> Any:
+    """
+    Return the most recently pushed element with the context value to match, None if there is
+    no such element, or _UNINDEXED if the stack cannot be searched by context value.
+    """
+    if stack is None or "context" not in match:
+        return _UNINDEXED
+    try:
+        return stack._last.get(match["context"])
+    except TypeError:  # unhashable context value
+        return _UNINDEXED
+
+
+def _find_same(element: _Element | None, test) -> Generator[Any, None, None]:
+    while element is not None:
+        if test <= element._value.items():
+            yield element._value
+        element = element._prev_same
 
 
 def first(*args, **kwargs) -> Any:
@@ -151,8 +274,12 @@ def first(*args, **kwargs) -> Any:
     • first(mapping): match is expressed as a mapping object's key-value pairs
     • first(**kwargs): match is expressed with name-value pairs in keyword arguments
     """
+    match = dict(*args, **kwargs)
+    stack = _stack.get(None)
+    if match.keys() == {"context"} and (same := _same(stack, match)) is not _UNINDEXED:
+        return stack._first[match["context"]]._value if same is not None else None
     result = None
-    for result in find(*args, **kwargs):
+    for result in find(match):
         pass
     return result
 
@@ -166,4 +293,30 @@ def last(*args, **kwargs) -> Any:
     • last(mapping): match is expressed as a mapping object's key-value pairs
     • last(**kwargs): match is expressed with name-value pairs in keyword arguments
     """
-    return next(iter(find(*args, **kwargs)), None)
+    match = dict(*args, **kwargs)
+    if (same := _same(_stack.get(None), match)) is not _UNINDEXED:
+        test = match.items()
+        while same is not None and not test <= same._value.items():
+            same = same._prev_same
+        return same._value if same is not None else None
+    return next(iter(find(match)), None)
+
+
+def memo_scope() -> StackContextManager:
+    """
+    Push a new memo scope onto the execution context stack, and return a context manager that
+    will pop the scope from the stack upon exit.
+
+    A memo scope contains a "memo" dictionary, in which values can be memoized for the
+    lifetime of the scope (e.g. the handling of a request).
+    """
+    return push(context="fondat.memo", memo={})
+
+
+def memo() -> dict[Any, Any] | None:
+    """
+    Return the dictionary of the most recently pushed memo scope on the context stack, or
+    None if no memo scope exists.
+    """
+    scope = last(context="fondat.memo")
+    return scope["memo"] if scope is not None else None
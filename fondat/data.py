@@ -16,9 +16,10 @@ T = TypeVar("T")
 
 def _datacls_init(dc: type):
     fields = {field.name: field for field in dataclasses.fields(dc) if field.init}
+    hints = None  # resolved on first use, to allow forward references
 
     def __init__(self, **kwargs):
-        hints = get_type_hints(self, include_extras=True)
+        nonlocal hints
 
         for name in kwargs:
             if name not in fields:
@@ -31,10 +32,12 @@ def _datacls_init(dc: type):
                     value = field.default_factory()
                 elif field.default is not dataclasses.MISSING:
                     value = field.default
-                elif is_optional(hints[field.name]):
-                    value = None
                 else:
-                    raise TypeError(f"missing required keyword argument: '{field.name}'")
+                    if hints is None:
+                        hints = get_type_hints(self, include_extras=True)
+                    if not is_optional(hints[field.name]):
+                        raise TypeError(f"missing required keyword argument: '{field.name}'")
+                    value = None
             setattr(self, field.name, value)
 
         post_init = getattr(self, "__post_init__", MISSING)
@@ -0,0 +1,79 @@
+"""
+Module to manage deadlines for the completion of work.
+
+A deadline is pushed onto the execution context stack, and applies to all work performed
+within its context, including nested operations, database statements and stream reads. A
+deadline pushed onto the stack can shorten, but never extend, a deadline already in effect.
+
+Deadlines are expressed in the time of the monotonic clock. When a deadline is exceeded,
+GatewayTimeoutError is raised, which cancels the work that is in progress.
+"""
+
+import asyncio
+import fondat.context as context
+import time
+
+from contextlib import asynccontextmanager
+from fondat.error import errors
+
+
+def push(timeout: int | float) -> context.StackContextManager:
+    """
+    Push a deadline onto the execution context stack, and return a context manager that will
+    pop the deadline from the stack upon exit.
+
+    Parameters:
+    • timeout: time in seconds from now that work must be completed by
+
+    If a deadline earlier than the one specified is already in effect, it remains in effect.
+    """
+    deadline = time.monotonic() + timeout
+    if (current := get()) is not None and current < deadline:
+        deadline = current
+    return context.push(context="fondat.deadline", deadline=deadline)
+
+
+def clear() -> context.StackContextManager:
+    """
+    Push onto the execution context stack an element that removes any deadline in effect,
+    and return a context manager that will pop the element from the stack upon exit.
+
+    This allows work that is shared by multiple callers, or that outlives its caller (e.g. a
+    background task), to be performed without the deadline of the caller that started it.
+    """
+    return context.push(context="fondat.deadline", deadline=None)
+
+
+def get() -> float | None:
+    """Return the deadline in effect, or None if there is no deadline."""
+    element = context.last(context="fondat.deadline")
+    return element["deadline"] if element is not None else None
+
+
+def remaining() -> float | None:
+    """Return the time in seconds remaining until the deadline, or None if no deadline."""
+    deadline = get()
+    return deadline - time.monotonic() if deadline is not None else None
+
+
+@asynccontextmanager
+async def enforce():
+    """
+    Return an asynchronous context manager that enforces the deadline in effect. If the
+    deadline is exceeded, work within the context is cancelled and GatewayTimeoutError is
+    raised.
+    """
+    seconds = remaining()
+    if seconds is None:
+        yield
+        return
+    if seconds <= 0:
+        raise errors.GatewayTimeoutError("deadline exceeded")
+    timeout = asyncio.timeout(seconds)
+    try:
+        async with timeout:
+            yield
+    except TimeoutError as te:
+        if timeout.expired():
+            raise errors.GatewayTimeoutError("deadline exceeded") from te
+        raise
@@ -0,0 +1,186 @@
+"""
+Module to execute synchronous functions in managed thread and process pools.
+
+Functions are executed with the execution context stack of the caller. In a thread, the
+caller's context is used as is. In a process, the values on the stack that can be pickled are
+transferred to the process; other values are omitted.
+
+The bind and bind_process functions prepare calls that preserve the execution context stack,
+to be executed by any executor, including those not managed by this module.
+
+Pools are created on first use. Applications are free to supply their own pools through the
+`set_pool` function.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import contextvars
+import fondat.context as context
+import functools
+import importlib
+import pickle
+
+from collections.abc import Callable
+from typing import Any, Literal, TypeVar
+
+
+R = TypeVar("R")
+
+Kind = Literal["thread", "process"]
+
+
+_pools: dict[str, concurrent.futures.Executor] = {}
+
+
+def get_pool(kind: Kind) -> concurrent.futures.Executor:
+    """Return the managed pool of the specified kind, creating it if necessary."""
+    if (pool := _pools.get(kind)) is None:
+        match kind:
+            case "thread":
+                pool = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="fondat")
+            case "process":
+                pool = concurrent.futures.ProcessPoolExecutor()
+            case _:
+                raise ValueError(f"unsupported pool kind: {kind}")
+        _pools[kind] = pool
+    return pool
+
+
+def set_pool(kind: Kind, pool: concurrent.futures.Executor | None) -> None:
+    """Set the managed pool of the specified kind, or None to create a default on next use."""
+    if pool is None:
+        _pools.pop(kind, None)
+    else:
+        _pools[kind] = pool
+
+
+def shutdown(wait: bool = True) -> None:
+    """Shut down all managed pools."""
+    while _pools:
+        _pools.popitem()[1].shutdown(wait=wait)
+
+
+atexit.register(shutdown)
+
+
+def picklable(value: Any) -> bool:
+    """Return whether a context stack value can be pickled, to be sent to a process."""
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return False
+    return True
+
+
+def bind(function: Callable[..., R], *args) -> Callable[[], R]:
+    """
+    Return a callable that calls a function with the execution context of the caller, to be
+    executed in a thread by any executor (e.g. loop.run_in_executor).
+
+    Parameters:
+    • function: function to call
+    • args: positional arguments to pass to function
+
+    The function is called with a copy of the caller's context, including the execution
+    context stack. To pass keyword arguments, use functools.partial.
+    """
+    return functools.partial(contextvars.copy_context().run, function, *args)
+
+
+class _ProcessCall:
+    """A picklable call of a function, with a snapshot of the execution context stack."""
+
+    __slots__ = ("snapshot", "function", "args")
+
+    def __init__(self, snapshot: list[Any], function: Callable, args: tuple):
+        self.snapshot = snapshot
+        self.function = function
+        self.args = args
+
+    def _call(self):
+        with context.restore(self.snapshot):
+            return self.function(*self.args)
+
+    def __call__(self):
+        return contextvars.Context().run(self._call)  # isolate from other calls in worker
+
+
+def bind_process(
+    function: Callable[..., R],
+    *args,
+    select: Callable[[Any], bool] = picklable,
+) -> Callable[[], R]:
+    """
+    Return a picklable callable that calls a function with a snapshot of the caller's
+    execution context stack, to be executed in a process by any executor (e.g.
+    loop.run_in_executor with a ProcessPoolExecutor).
+
+    Parameters:
+    • function: function to call
+    • args: positional arguments to pass to function
+    • select: function that returns whether a stack value is sent  [picklable values]
+
+    The function and its arguments must be picklable. To pass keyword arguments, use
+    functools.partial.
+    """
+    return _ProcessCall(context.snapshot(select), function, args)
+
+
+async def run(kind: Kind, function: Callable[..., R], *args, **kwargs) -> R:
+    """
+    Execute a synchronous function in a managed pool, returning its result.
+
+    Parameters:
+    • kind: kind of pool to execute function in
+    • function: function to execute
+    • args: positional arguments to pass to function
+    • kwargs: keyword arguments to pass to function
+
+    To execute in a process, the function and its arguments must be picklable; only the
+    picklable values of the execution context stack are sent to the process.
+    """
+    if kwargs:
+        function = functools.partial(function, **kwargs)
+    call = (bind if kind == "thread" else bind_process)(function, *args)
+    return await asyncio.get_running_loop().run_in_executor(get_pool(kind), call)
+
+
+def _resolve(module: str, qualname: str) -> Any:
+    obj = importlib.import_module(module)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def _call_operation(module: str, qualname: str, instance: Any, args, kwargs) -> Any:
+    return _resolve(module, qualname).__wrapped__(instance, *args, **kwargs)
+
+
+async def run_operation(
+    kind: Kind, function: Callable[..., R], instance: Any, *args, **kwargs
+) -> R:
+    """
+    Execute a synchronous resource operation method in a managed pool, returning its result.
+
+    Parameters:
+    • kind: kind of pool to execute method in
+    • function: bound operation method, with arguments validated when called
+    • instance: resource object that the method is bound to
+    • args: positional arguments to pass to method
+    • kwargs: keyword arguments to pass to method
+
+    To execute in a process, the operation is resolved by name in the process; the resource
+    object and arguments must be picklable.
+    """
+    if kind == "thread":
+        return await run(kind, function, *args, **kwargs)
+    return await run(
+        kind,
+        _call_operation,
+        function.__module__,
+        function.__qualname__,
+        instance,
+        args,
+        kwargs,
+    )
@@ -2,8 +2,12 @@
 
 import asyncio
 import base64
+import fondat.context as context
+import fondat.deadline
 import fondat.error
+import fondat.monitor as monitor
 import fondat.resource
+import fondat.trace
 import fondat.types
 import functools
 import http
@@ -436,6 +440,37 @@ async def simple_error_filter(request: Request):
         yield response
 
 
+def deadline_filter(*, header: str | None = "Request-Timeout", timeout: float | None = None):
+    """
+    Return an HTTP filter that sets a deadline for handling requests (see fondat.deadline).
+
+    Parameters:
+    • header: name of request header containing timeout in seconds, or None to ignore
+    • timeout: default and maximum timeout in seconds  [unlimited]
+
+    The timeout requested in the header, if valid, is used if it does not exceed the timeout
+    parameter. If a deadline is exceeded while handling the request, GatewayTimeoutError is
+    raised.
+    """
+
+    async def filter(request: Request):
+        seconds = timeout
+        if header and (value := request.headers.get(header)) is not None:
+            try:
+                requested = float(value)
+            except ValueError:
+                requested = None
+            if requested is not None and requested >= 0:
+                seconds = min(requested, timeout) if timeout is not None else requested
+        if seconds is None:
+            yield
+            return
+        with fondat.deadline.push(seconds):
+            yield
+
+    return filter
+
+
 async def _decode_body(operation: Any, request: Request):
     body_type = get_body_type(operation)
     if not body_type:
@@ -470,6 +505,10 @@ class Application:
 
     An HTTP application is a request handler; it's a coroutine that handles an HTTP request
     and returns an HTTP response. For a description of filters, see: Chain.
+
+    Each request is handled within its own memo scope on the context stack. If any monitors
+    are registered, the duration of each request is recorded as an "http_request_duration"
+    histogram measurement. Each request is traced in an "http.request" span (see fondat.trace).
     """
 
     def __init__(
@@ -486,7 +525,21 @@ class Application:
         self.filters = list(filters or [])
 
     async def __call__(self, request: Request) -> Response:
-        return await Chain(filters=self.filters, handler=self._handle)(request)
+        with (
+            context.memo_scope(),
+            fondat.trace.span("http.request", method=request.method, path=request.path) as span,
+        ):
+            if not monitor.monitors:  # skip measurement when nothing is listening
+                response = await Chain(filters=self.filters, handler=self._handle)(request)
+            else:
+                tags = {"method": request.method.lower()}
+                async with monitor.timer(
+                    name="http_request_duration", tags=tags, type="histogram"
+                ):
+                    response = await Chain(filters=self.filters, handler=self._handle)(request)
+            if span:
+                span.tags["status"] = response.status
+            return response
 
     async def _handle(self, request: Request) -> Response:
         if not request.path.startswith(self.path):
@@ -4,15 +4,16 @@ from __future__ import annotations
 
 import fondat.error
 
-from collections import namedtuple
+from collections import OrderedDict, deque, namedtuple
+from collections.abc import Callable
 from copy import deepcopy
-from fondat.codec import StringCodec
+from fondat.codec import BinaryCodec, StringCodec
 from fondat.error import NotFoundError
 from fondat.http import AsBody
 from fondat.resource import mutation, operation, resource
 from fondat.stream import Stream
 from time import time
-from typing import Annotated, Generic, TypeVar
+from typing import Annotated, Any, Generic, Literal, TypeVar
 
 
 K = TypeVar("K")
@@ -27,11 +28,34 @@ class MemoryResource(Generic[K, V]):
     • key_type: type of item key
     • value_type: type of each item
     • size: maximum number of items to store  [unlimited]
-    • evict: evict oldest item to make room for new item
+    • evict: evict an item to make room for new item
     • expire: time to expire items in seconds  [unlimited]
+    • policy: policy to select item to evict
+    • max_bytes: maximum total size of items to store in bytes  [unlimited]
+    • sizer: function that returns the size of a value in bytes  [length of encoded value]
+    • storage: how values are stored and returned
+
+    Eviction policies:
+    • "oldest": evict the least recently stored item
+    • "lru": evict the least recently stored or read item
+    • "lfu": evict the least frequently stored or read item; the least recently used among
+      items with the same frequency
+
+    If a maximum size in bytes is specified, the size of each item is computed when it is
+    stored; by default, this is the length of the value encoded with its binary codec. Items
+    are evicted until the new item fits within the budget. An item larger than the entire
+    budget cannot be stored.
+
+    Storage modes:
+    • "copy": values are stored as supplied, and a deep copy is returned on each read
+    • "encoded": values are stored encoded with their binary codec, and decoded on each read
+    • "reference": values are stored and returned by reference; they must not be modified
+
+    Reading, storing, evicting and expiring items each take constant (amortized) time,
+    regardless of the number of items stored.
     """
 
-    _Item = namedtuple("_Item", "value,time")
+    _Item = namedtuple("_Item", "value,time,size", defaults=(0,))
 
     @resource
     class ItemResource(Generic[K, V]):
@@ -50,41 +74,27 @@ class MemoryResource(Generic[K, V]):
         @operation
         async def get(self) -> V:
             """Get item."""
-            item = self.memory._storage.get(self.key)
-            if not item or (self.memory.expire and time() > item.time + self.memory.expire):
+            item = self.memory._read(self.key)
+            if item is None:
                 raise NotFoundError
-            return deepcopy(item.value)
+            match self.memory.storage:
+                case "copy":
+                    return deepcopy(item.value)
+                case "encoded":
+                    return self.memory._value_codec.decode(item.value)
+            return item.value
 
         @operation
         async def put(self, value: Annotated[V, AsBody]) -> None:
             """Store item."""
-            now = time()
-            if self.memory.expire:  # purge expired entries
-                for key in {
-                    key
-                    for key, item in self.memory._storage.items()
-                    if item.time + self.memory.expire <= now
-                }:
-                    del self.memory._storage[key]
-            if self.memory.size and self.memory.evict:  # evict oldest entry
-                Oldest = namedtuple("Oldest", "key,time")
-                self.memory._storage.pop(self.key, None)
-                while len(self.memory._storage) >= self.memory.size:
-                    oldest = None
-                    for key, item in self.memory._storage.items():
-                        if not oldest or item.time < oldest.time:
-                            oldest = Oldest(key, item.time)
-                    if oldest:
-                        self.memory._storage.pop(oldest.key, None)
-            if self.memory.size and len(self.memory._storage) >= self.memory.size:
-                raise fondat.error.errors.InsufficientStorageError
-            self.memory._storage[self.key] = MemoryResource._Item(value, now)
+            self.memory._write(self.key, value)
 
         @operation
         async def delete(self) -> None:
             """Delete item."""
-            await self.get()  # ensure item exists and has not expired
-            self.memory._storage.pop(self.key, None)
+            if self.memory._read(self.key, touch=False) is None:
+                raise NotFoundError
+            self.memory._remove(self.key)
 
     def __init__(
         self,
@@ -93,16 +103,135 @@ class MemoryResource(Generic[K, V]):
         size: int | None = None,
         evict: bool = False,
         expire: int | float | None = None,
+        policy: Literal["oldest", "lru", "lfu"] = "oldest",
+        max_bytes: int | None = None,
+        sizer: Callable[[V], int] | None = None,
+        storage: Literal["copy", "encoded", "reference"] = "copy",
     ):
         self.key_type = key_type
         self._key_codec = StringCodec.get(key_type)
         if value_type is Stream:
             raise TypeError("value type not supported: {value_type}")
+        if policy not in {"oldest", "lru", "lfu"}:
+            raise ValueError(f"unsupported eviction policy: {policy}")
+        if storage not in {"copy", "encoded", "reference"}:
+            raise ValueError(f"unsupported storage mode: {storage}")
         self.value_type = value_type
         self.size = size
         self.evict = evict
         self.expire = expire
-        self._storage: dict[str, "MemoryResource._Item"] = {}
+        self.policy = policy
+        self.max_bytes = max_bytes
+        self.sizer = sizer
+        self.storage = storage
+        self._value_codec = (  # only resolved if values are encoded
+            BinaryCodec.get(value_type)
+            if storage == "encoded" or (max_bytes is not None and sizer is None)
+            else None
+        )
+        self.bytes = 0  # total size of stored items
+        self._storage: OrderedDict[str, "MemoryResource._Item"] = OrderedDict()
+        self._expiry = deque()  # (time, key) in order stored
+        self._counts: dict[str, int] = {}  # lfu: key → frequency
+        self._frequencies: dict[int, OrderedDict[str, None]] = {}  # lfu: frequency → keys
+        self._min_frequency = 0
+
+    def _expired(self, item: "MemoryResource._Item", now: float) -> bool:
+        return self.expire is not None and item.time + self.expire <= now
+
+    def _purge(self, now: float) -> None:
+        """Remove expired items, in the order they were stored."""
+        while self._expiry and self._expiry[0][0] + self.expire <= now:
+            stored, key = self._expiry.popleft()
+            item = self._storage.get(key)
+            if item is not None and item.time == stored:  # not stored again since
+                self._remove(key)
+
+    def _use(self, key: str) -> None:
+        """Record the use of an item, for its eviction policy."""
+        match self.policy:
+            case "lru":
+                self._storage.move_to_end(key)
+            case "lfu":
+                count = self._counts.get(key, 0)
+                if count:
+                    keys = self._frequencies[count]
+                    del keys[key]
+                    if not keys:
+                        del self._frequencies[count]
+                        if self._min_frequency == count:
+                            self._min_frequency = count + 1
+                else:
+                    self._min_frequency = 1
+                self._counts[key] = count + 1
+                self._frequencies.setdefault(count + 1, OrderedDict())[key] = None
+
+    def _victim(self) -> str:
+        """Return the key of the item to evict."""
+        if self.policy != "lfu":
+            return next(iter(self._storage))
+        if self._min_frequency not in self._frequencies:  # minimum item removed
+            self._min_frequency = min(self._frequencies)
+        return next(iter(self._frequencies[self._min_frequency]))
+
+    def _read(self, key: str, touch: bool = True) -> "MemoryResource._Item | None":
+        item = self._storage.get(key)
+        if item is None:
+            return None
+        if self._expired(item, time()):
+            self._remove(key)
+            return None
+        if touch:
+            self._use(key)
+        return item
+
+    def _full(self, key: str, size: int) -> bool:
+        """Return whether an item must be removed to store an item of the specified size."""
+        existing = self._storage.get(key)
+        if self.size and existing is None and len(self._storage) >= self.size:
+            return True
+        if self.max_bytes is not None:
+            return self.bytes - (existing.size if existing else 0) + size > self.max_bytes
+        return False
+
+    def _size(self, value: Any, stored: Any) -> int:
+        if self.sizer is not None:
+            return self.sizer(value)
+        if self.storage == "encoded":
+            return len(stored)
+        return len(self._value_codec.encode(value))
+
+    def _write(self, key: str, value: Any) -> None:
+        now = time()
+        stored = self._value_codec.encode(value) if self.storage == "encoded" else value
+        size = self._size(value, stored) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            raise fondat.error.errors.InsufficientStorageError
+        if self.expire is not None:
+            self._purge(now)
+        if self._full(key, size):
+            if not self.evict:
+                raise fondat.error.errors.InsufficientStorageError
+            while self._full(key, size):
+                self._remove(self._victim())
+        if (existing := self._storage.get(key)) is not None:
+            self.bytes -= existing.size
+        self._storage[key] = MemoryResource._Item(stored, now, size)
+        self.bytes += size
+        if self.policy == "oldest":
+            self._storage.move_to_end(key)
+        self._use(key)
+        if self.expire is not None:
+            self._expiry.append((now, key))
+
+    def _remove(self, key: str) -> None:
+        if (item := self._storage.pop(key, None)) is not None:
+            self.bytes -= item.size
+        if (count := self._counts.pop(key, None)) is not None:
+            keys = self._frequencies[count]
+            del keys[key]
+            if not keys:
+                del self._frequencies[count]
 
     @operation
     async def get(self) -> list[K]:
@@ -111,13 +240,17 @@ class MemoryResource(Generic[K, V]):
         return [
             self._key_codec.decode(key)
             for key, item in self._storage.items()
-            if not self.expire or item.time + self.expire <= now
+            if not self._expired(item, now)
         ]
 
     @mutation
     async def clear(self) -> None:
         """Remove all items from collection."""
         self._storage.clear()
+        self.bytes = 0
+        self._expiry.clear()
+        self._counts.clear()
+        self._frequencies.clear()
 
     def __getitem__(self, key: K) -> "MemoryResource.ItemResource[K, V]":
         return self.ItemResource(self, self._key_codec.encode(key))
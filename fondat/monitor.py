@@ -3,12 +3,30 @@ Fondat monitor module.
 
 A global "monitors" object is a list of monitors and a monitor itself. Applications are free
 to add/remove their own monitors to/from this object.
+
+A global "sample_rates" object is a dict that maps measurement names to the rates (between 0
+and 1) at which timers and counters with those names are sampled. Applications are free to
+add/remove sample rates to/from this object. Timers and counters are not measured at all if
+there are no monitors to record them.
+
+To keep the cost of recording measurements off the request path, an Aggregator can be added
+to the global monitors; it aggregates measurements in memory, and periodically records them
+in downstream monitors.
+
+A LoopMonitor measures the health of the event loop, to attribute latency to stalls of the
+loop and the operations that cause them.
 """
 
 import asyncio
+import collections.abc
+import fondat.context as context
+import logging
+import math
+import random
 import time
 
-from contextlib import asynccontextmanager
+from collections.abc import Iterable
+from contextlib import asynccontextmanager, suppress
 from dataclasses import field
 from datetime import datetime, timezone
 from fondat.data import datacls
@@ -16,9 +34,12 @@ from fondat.validation import MinLen, validate
 from typing import Annotated, Literal
 
 
+_logger = logging.getLogger(__name__)
+
+
 # type aliases
 Name = Annotated[str, MinLen(1)]
-Type = Literal["counter", "gauge"]
+Type = Literal["counter", "gauge", "histogram"]
 Tags = dict[str, str]
 Value = int | float
 
@@ -42,6 +63,9 @@ class Measurement:
     Name should be an identifier, expressed in snake_case, which describes the metric being
     measured (e.g. "operation_invocations", "operation_duration").
 
+    A counter value is an increment to a count; a gauge value is a measured level; a
+    histogram value is a single observation in a distribution of values (e.g. a duration).
+
     Unit should be a standard symbol (e.g. SI symbol "s" for seconds). If unit is a rate,
     symbols separated by a slash "/" character should be used (e.g. "m/s" for metres per
     second).
@@ -57,6 +81,20 @@ class Measurement:
     def __post_init__(self):
         validate(self, Measurement)
 
+    @classmethod
+    def _taken(cls, name: str, tags: Tags | None, type: Type, value: Value, unit: str | None):
+        """Return a measurement taken by this module, without the cost of validation."""
+        if not isinstance(name, str) or not name:
+            raise ValueError("invalid measurement name")
+        measurement = cls.__new__(cls)
+        measurement.name = name
+        measurement.tags = tags
+        measurement.timestamp = _now()
+        measurement.type = type
+        measurement.value = value
+        measurement.unit = unit
+        return measurement
+
 
 class Monitor:
     """Base class for a monitor that records measurements."""
@@ -75,15 +113,395 @@ class Monitors(Monitor, list[Monitor]):
 
     async def record(self, measurement: Measurement) -> None:
         """Record a measurement in monitors."""
-        await asyncio.gather(monitor.record(measurement) for monitor in self)
+        if len(self) == 1:  # avoid the cost of gather
+            await self[0].record(measurement)
+        elif self:
+            await asyncio.gather(*(monitor.record(measurement) for monitor in self))
 
     async def flush(self) -> None:
         """Flush all cached measurements."""
-        await asyncio.gather(monitor.flush() for monitor in self)
+        await asyncio.gather(*(monitor.flush() for monitor in self))
+
+
+class Histogram:
+    """
+    A mergeable sketch of a distribution of values, from which quantiles can be estimated.
+
+    Parameters and attributes:
+    • accuracy: relative accuracy of estimated quantiles
+
+    Values are counted in buckets with logarithmically increasing bounds, such that any
+    quantile estimate is within the relative accuracy of the actual value. Memory use grows
+    with the logarithm of the range of values, not with the number of values. Values less than
+    or equal to zero are counted in a single zero bucket. Histograms with the same accuracy can
+    be merged.
+
+    Attributes:
+    • count: number of values added
+    • sum: sum of values added
+    • min: minimum value added
+    • max: maximum value added
+    """
+
+    __slots__ = (
+        "accuracy",
+        "count",
+        "sum",
+        "min",
+        "max",
+        "_gamma",
+        "_log_gamma",
+        "_zero",
+        "_buckets",
+    )
+
+    def __init__(self, accuracy: float = 0.01):
+        if not 0 < accuracy < 1:
+            raise ValueError("accuracy must be between 0 and 1")
+        self.accuracy = accuracy
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._zero = 0
+        self._buckets: dict[int, int] = {}
+
+    def add(self, value: Value) -> None:
+        """Add a value to the histogram."""
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= 0:
+            self._zero += 1
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def merge(self, other: "Histogram") -> None:
+        """Merge the values of another histogram into this histogram."""
+        if other.accuracy != self.accuracy:
+            raise ValueError("cannot merge histograms with different accuracy")
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._zero += other._zero
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Return the estimated value at the specified quantile, or None if the histogram is
+        empty.
+
+        Parameters:
+        • q: quantile, between 0 and 1 inclusive
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("quantile must be between 0 and 1")
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self._zero
+        if rank < seen:
+            return min(max(0.0, self.min), self.max)
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                value = 2 * self._gamma**index / (self._gamma + 1)  # bucket midpoint
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+class Aggregator(Monitor):
+    """
+    A monitor that aggregates measurements in memory, and periodically records the aggregates
+    in downstream monitors.
+
+    Parameters and attributes:
+    • monitors: downstream monitors to record aggregated measurements
+    • interval: time in seconds between periodic flushes
+
+    • quantiles: quantiles of histograms to record
+
+    Measurements are aggregated by name, type, unit and tags. Counter values are summed;
+    gauges retain the last value recorded; histogram values are added to a Histogram.
+    Recording a measurement updates the aggregates in memory without awaiting any downstream
+    monitor. Upon flush, each aggregate is recorded in downstream monitors, timestamped at the
+    time of flush. A histogram is recorded as "{name}_count" and "{name}_sum" counters, and
+    a gauge for each quantile, with the quantile in a "quantile" tag.
+
+    Periodic flushing is performed by a background task, which is started by calling the
+    start method, and stopped by calling the stop method; stopping performs a final flush.
+    """
+
+    def __init__(
+        self,
+        monitors: Iterable[Monitor],
+        interval: int | float = 60,
+        quantiles: Iterable[float] = (0.5, 0.95, 0.99),
+    ):
+        self.monitors = Monitors(monitors)
+        self.interval = interval
+        self.quantiles = tuple(quantiles)
+        self._aggregates = {}
+        self._task = None
+
+    async def record(self, measurement: Measurement) -> None:
+        """Aggregate a measurement."""
+        tags = measurement.tags
+        key = (
+            measurement.name,
+            measurement.type,
+            measurement.unit,
+            tuple(sorted(tags.items())) if tags else None,
+        )
+        match measurement.type:
+            case "counter" if key in self._aggregates:
+                self._aggregates[key] += measurement.value
+            case "histogram":
+                if (histogram := self._aggregates.get(key)) is None:
+                    histogram = self._aggregates[key] = Histogram()
+                histogram.add(measurement.value)
+            case _:
+                self._aggregates[key] = measurement.value
+
+    async def flush(self) -> None:
+        """Record aggregated measurements in downstream monitors, and flush them."""
+        aggregates, self._aggregates = self._aggregates, {}
+        timestamp = _now()
+        for (name, type, unit, tags), value in aggregates.items():
+            tags = dict(tags) if tags is not None else None
+            if type == "histogram":
+                measurements = [
+                    Measurement(
+                        name=f"{name}_count",
+                        tags=tags,
+                        timestamp=timestamp,
+                        type="counter",
+                        value=value.count,
+                        unit=None,
+                    ),
+                    Measurement(
+                        name=f"{name}_sum",
+                        tags=tags,
+                        timestamp=timestamp,
+                        type="counter",
+                        value=value.sum,
+                        unit=unit,
+                    ),
+                ]
+                measurements.extend(
+                    Measurement(
+                        name=name,
+                        tags=(tags or {}) | {"quantile": str(q)},
+                        timestamp=timestamp,
+                        type="gauge",
+                        value=value.quantile(q),
+                        unit=unit,
+                    )
+                    for q in self.quantiles
+                )
+            else:
+                measurements = [
+                    Measurement(
+                        name=name,
+                        tags=tags,
+                        timestamp=timestamp,
+                        type=type,
+                        value=value,
+                        unit=unit,
+                    )
+                ]
+            for measurement in measurements:
+                await self.monitors.record(measurement)
+        await self.monitors.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                _logger.exception("error flushing aggregated measurements")
+
+    def start(self) -> None:
+        """Start periodic flushing of aggregated measurements."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop periodic flushing, and flush aggregated measurements."""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+
+class _TimedCoroutine(collections.abc.Coroutine):
+    """Coroutine wrapper that times each step of the wrapped coroutine."""
+
+    __slots__ = ("_coro", "_loop_monitor")
+
+    def __init__(self, coro, loop_monitor):
+        self._coro = coro
+        self._loop_monitor = loop_monitor
+
+    def _step(self, method, *args):
+        begin = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            duration = time.perf_counter() - begin
+            if duration >= self._loop_monitor.slow:
+                self._loop_monitor._slow_step(self._coro, duration)
+
+    def send(self, value):
+        return self._step(self._coro.send, value)
+
+    def throw(self, *args):
+        return self._step(self._coro.throw, *args)
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    def __getattr__(self, name):
+        return getattr(self._coro, name)
+
+
+class LoopMonitor:
+    """
+    Measures the health of the running event loop, and records measurements in a monitor.
+
+    Parameters and attributes:
+    • interval: time in seconds between measurements
+    • slow: duration in seconds of a task step to be considered slow  [not detected]
+    • monitor: monitor to record measurements  [global monitors]
+
+    Measurements are recorded on each interval:
+    • event_loop_lag: gauge of the delay in seconds of a timer scheduled on the loop
+    • event_loop_tasks: gauge of the number of tasks that are not done
+    • event_loop_slow_steps: counter of task steps that blocked the loop for at least the
+      slow duration, tagged with the resource and operation in effect on the context stack
+      of the task when the step yielded
+
+    Slow steps are detected by installing a task factory on the loop, which times each step
+    of tasks created while the monitor is started; this incurs a small cost for each step. Slow
+    steps are also logged as warnings.
+    """
+
+    def __init__(
+        self,
+        interval: int | float = 1,
+        slow: int | float | None = None,
+        monitor: Monitor | None = None,
+    ):
+        self.interval = interval
+        self.slow = slow
+        self.monitor = monitor
+        self._task = None
+        self._factory = None
+        self._slow_steps = {}  # tags: count
+
+    def _slow_step(self, coro, duration: float) -> None:
+        tags = ()
+        where = getattr(coro, "__qualname__", repr(coro))
+        if (operation := context.last(context="fondat.operation")) is not None:
+            resource, operation = operation["resource"], operation["operation"]
+            tags = (("resource", resource), ("operation", operation))
+            where = f"{resource}.{operation}"
+        self._slow_steps[tags] = self._slow_steps.get(tags, 0) + 1
+        _logger.warning("slow task step: %.3fs in %s", duration, where)
+
+    def _task_factory(self, loop, coro, **kwargs):
+        coro = _TimedCoroutine(coro, self)
+        if self._factory is not None:
+            return self._factory(loop, coro, **kwargs)
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            begin = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - begin - self.interval, 0.0)
+            slow_steps, self._slow_steps = self._slow_steps, {}
+            try:
+                await record(
+                    Measurement._taken(
+                        name="event_loop_lag", tags=None, type="gauge", value=lag, unit="s"
+                    ),
+                    self.monitor,
+                )
+                await record(
+                    Measurement._taken(
+                        name="event_loop_tasks",
+                        tags=None,
+                        type="gauge",
+                        value=len([t for t in asyncio.all_tasks() if not t.done()]),
+                        unit=None,
+                    ),
+                    self.monitor,
+                )
+                for tags, count in slow_steps.items():
+                    await record(
+                        Measurement._taken(
+                            name="event_loop_slow_steps",
+                            tags=dict(tags) or None,
+                            type="counter",
+                            value=count,
+                            unit=None,
+                        ),
+                        self.monitor,
+                    )
+            except Exception:
+                _logger.exception("error recording event loop measurements")
+
+    def start(self) -> None:
+        """Start measuring the health of the running event loop."""
+        if self._task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        if self.slow is not None:
+            self._factory = loop.get_task_factory()
+            loop.set_task_factory(self._task_factory)
+        self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop measuring the health of the event loop."""
+        if self._task is None:
+            return
+        if self.slow is not None:
+            asyncio.get_running_loop().set_task_factory(self._factory)
+            self._factory = None
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
 
 
 monitors = Monitors()
 
+sample_rates: dict[str, float] = {}
+
+
+def _sample(name: str, monitor: Monitor | None) -> float | None:
+    """Return the sample rate of a measurement to be taken, or None to skip measurement."""
+    if not (monitor if monitor is not None else monitors):  # nothing is listening
+        return None
+    rate = sample_rates.get(name, 1.0)
+    if rate < 1.0 and random.random() >= rate:
+        return None
+    return rate
+
 
 @asynccontextmanager
 async def timer(
@@ -91,23 +509,29 @@ async def timer(
     name: Name,
     tags: Tags | None = None,
     monitor: Monitor | None = None,
+    type: Literal["gauge", "histogram"] = "gauge",
 ):
     """
     An asynchronous context manager that times the execution of work and records it as a
-    gauge measurement of duration in seconds.
+    measurement of duration in seconds.
 
     Parameters:
     • name: measurement name
     • tags: key-value pairs that qualify the measurement
     • monitor: monitor to record measurement  [global monitors]
+    • type: type of measurement to record
 
-    If an exception is raised during execution, the measurement will not be recorded.
+    If an exception is raised during execution, the measurement will not be recorded. If a
+    sample rate is set for the measurement name, only that proportion of executions are timed.
     """
+    if _sample(name, monitor) is None:
+        yield
+        return
     begin = time.perf_counter()
     yield
     duration = time.perf_counter() - begin
     await record(
-        Measurement(name=name, type="gauge", value=duration, unit="s", tags=tags),
+        Measurement._taken(name=name, tags=tags, type=type, value=duration, unit="s"),
         monitor,
     )
 
@@ -131,7 +555,13 @@ async def counter(
 
     If recording status, the value "success" will be added as a tag if execution was
     successful, or "failure" if an exception was raised during execution.
+
+    If a sample rate is set for the measurement name, only that proportion of executions are
+    counted, each with a value of the reciprocal of the rate, to estimate the actual count.
     """
+    if (rate := _sample(name, monitor)) is None:
+        yield
+        return
     exception = None
     try:
         yield
@@ -140,7 +570,13 @@ async def counter(
     if status:
         tags = {**(tags or {}), "status": "success" if not exception else "failure"}
     await record(
-        Measurement(name=name, type="counter", value=1, tags=tags),
+        Measurement._taken(
+            name=name,
+            tags=tags,
+            type="counter",
+            value=1 if rate == 1.0 else 1 / rate,
+            unit=None,
+        ),
         monitor,
     )
     if exception:
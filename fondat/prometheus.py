@@ -0,0 +1,123 @@
+"""
+Module to expose measurements in Prometheus text exposition format.
+
+A PrometheusMonitor accumulates measurements in memory; it can be added to the global monitors
+object (see fondat.monitor). A MetricsResource exposes the accumulated measurements, and can
+be mounted in any resource served by an HTTP application, to be scraped by Prometheus.
+"""
+
+import math
+
+from collections.abc import Iterable
+from fondat.monitor import Histogram, Measurement, Monitor
+from fondat.resource import operation, resource
+from fondat.stream import BytesStream, Stream
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(labels: Iterable[tuple[str, str]]) -> str:
+    labels = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return f"{{{labels}}}" if labels else ""
+
+
+def _number(value: int | float) -> str:
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+class PrometheusMonitor(Monitor):
+    """
+    A monitor that accumulates measurements, to be rendered in Prometheus text exposition
+    format.
+
+    Parameters and attributes:
+    • quantiles: quantiles of histograms to render
+
+    Counter values are accumulated in monotonically increasing totals; gauges retain the last
+    value recorded; histogram values are added to a Histogram, which is rendered as a
+    Prometheus summary. Measurements are accumulated by name and tags; the type of the first
+    measurement recorded for a name determines its Prometheus metric type.
+
+    Rendered output is cached per metric name; a scrape re-renders only the metrics that
+    recorded measurements since the previous scrape (e.g. the measurements of the scrape
+    itself), and renders nothing if no measurement was recorded.
+    """
+
+    def __init__(self, quantiles: Iterable[float] = (0.5, 0.95, 0.99)):
+        self.quantiles = tuple(quantiles)
+        self._types = {}  # name: type
+        self._series = {}  # name: {labels: value}
+        self._metrics = {}  # name: rendered metric
+        self._changed = set()  # names of metrics to render
+        self._rendered = None
+
+    async def record(self, measurement: Measurement) -> None:
+        """Accumulate a measurement."""
+        name = measurement.name
+        type = self._types.setdefault(name, measurement.type)
+        if type != measurement.type:
+            return  # conflicting type; cannot be expressed in the same metric
+        labels = tuple(sorted(measurement.tags.items())) if measurement.tags else ()
+        series = self._series.setdefault(name, {})
+        match type:
+            case "counter":
+                series[labels] = series.get(labels, 0) + measurement.value
+            case "gauge":
+                series[labels] = measurement.value
+            case "histogram":
+                if (histogram := series.get(labels)) is None:
+                    histogram = series[labels] = Histogram()
+                histogram.add(measurement.value)
+        self._changed.add(name)
+        self._rendered = None
+
+    def _render(self, name: str) -> str:
+        type = self._types[name]
+        lines = [f"# TYPE {name} {'summary' if type == 'histogram' else type}"]
+        for labels, value in sorted(self._series[name].items()):
+            if type != "histogram":
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                continue
+            for q in self.quantiles:
+                quantile = _labels((*labels, ("quantile", str(q))))
+                lines.append(f"{name}{quantile} {_number(value.quantile(q))}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(value.sum)}")
+            lines.append(f"{name}_count{_labels(labels)} {_number(value.count)}")
+        return "".join(f"{line}\n" for line in lines)
+
+    def render(self) -> bytes:
+        """Return accumulated measurements in Prometheus text exposition format."""
+        if self._rendered is None:
+            for name in self._changed:
+                self._metrics[name] = self._render(name)
+            self._changed.clear()
+            self._rendered = "".join(v for _, v in sorted(self._metrics.items())).encode()
+        return self._rendered
+
+
+@resource
+class MetricsResource:
+    """
+    Resource that exposes measurements in Prometheus text exposition format.
+
+    Parameters:
+    • monitor: monitor that accumulates measurements to expose
+    """
+
+    def __init__(self, monitor: PrometheusMonitor):
+        self.monitor = monitor
+
+    @operation
+    async def get(self) -> Stream:
+        """Return measurements in Prometheus text exposition format."""
+        return BytesStream(self.monitor.render(), CONTENT_TYPE)
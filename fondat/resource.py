@@ -12,19 +12,26 @@ For information on how security policies are evaluated, see the `authorize` func
 """
 
 import asyncio
+import fondat.cache
 import fondat.context as context
+import fondat.deadline
 import fondat.error
+import fondat.executor
 import fondat.monitor as monitor
+import fondat.trace
 import functools
 import inspect
 import logging
+import time
 import types
 import wrapt
 
 from collections.abc import Callable, Iterable, Mapping
 from contextlib import contextmanager, suppress
+from copy import deepcopy
+from fondat.bulkhead import Bulkhead
 from fondat.cache import CacheResource, hash_json
-from fondat.codec import JSONCodec
+from fondat.codec import DecodeError, JSONCodec
 from fondat.lazy import LazySimpleNamespace
 from fondat.security import Policy
 from fondat.types import literal_values
@@ -38,6 +45,21 @@ T = TypeVar("T")
 _logger = logging.getLogger(__name__)
 
 
+def _resource_name(cls: type) -> str:
+    """Return the fully-qualified name of a resource class."""
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _cached_result(value: Any) -> bool:
+    """Return if a cache entry value is a cached operation result."""
+    return (
+        isinstance(value, dict)
+        and "result" in value
+        and isinstance(value.get("time"), int | float)
+        and isinstance(value.get("tags", {}), dict)
+    )
+
+
 def _summary(function: Callable[..., Any]) -> str:
     """
     Derive summary information from a function's docstring or name. The summary is the first
@@ -120,6 +142,14 @@ def operation(
     publish: bool = True,
     deprecated: bool = False,
     cache: CacheResource | None = None,
+    cache_refresh: int | float | None = None,
+    cache_expire: int | float | None = None,
+    cache_tags: Callable[..., Iterable[str]] | None = None,
+    invalidates: Callable[..., Iterable[str]] | None = None,
+    bulkhead: Bulkhead | None = None,
+    memoize: bool = False,
+    timeout: int | float | None = None,
+    executor: Literal["thread", "process"] | None = None,
 ) -> T:
     """
     Decorate a resource class coroutine as an operation.
@@ -131,6 +161,14 @@ def operation(
     • publish: publish the operation in documentation
     • deprecated: flag the operation as deprecated
     • cache: resource to cache operation results
+    • cache_refresh: age in seconds after which a cached result is refreshed  [never]
+    • cache_expire: age in seconds after which a cached result is not returned  [never]
+    • cache_tags: function that returns tags to associate with a cached result
+    • invalidates: function that returns cache tags to invalidate after execution
+    • bulkhead: limits concurrent executions of the operation
+    • memoize: memoize query results within the current memo scope
+    • timeout: time in seconds that the operation must complete within
+    • executor: kind of pool to execute a synchronous operation function in
 
     The operation method is named and has the same semantics of HTTP methods: get, put,
     post, delete and patch. The method can be omitted in the operation decoration if the
@@ -151,6 +189,51 @@ def operation(
     The cache is a resource that exposes cache entry resources. A MemoryResource can serve as
     an operation cache resource out of the box. It is safe for a single cache resource to be
     shared by multiple operations.
+
+    On a cache miss, concurrent calls with the same cache key are coalesced into a single
+    execution of the operation; its result (or exception) is shared by all callers. The
+    execution continues if a waiting caller is cancelled.
+
+    Executions shared by callers (coalesced, memoized) and background refreshes are not
+    subject to the deadline of the caller that started them; each caller enforces its own
+    deadline while waiting. They are subject to the operation's own timeout, if specified.
+
+    A cached result older than cache_refresh is stale: it is returned immediately, while the
+    operation is executed in a background task to refresh the cache. A cached result older
+    than cache_expire is not returned; callers wait for the operation to execute. These ages
+    are tracked by the operation itself, independent of any expiry enforced by the cache
+    resource.
+
+    The cache_tags and invalidates functions are called with the resource object and the
+    operation arguments (including default values) as keyword arguments, and return an
+    iterable of tag strings. A cached result is stale once any of its tags is invalidated,
+    typically by a mutation declaring the same tags in invalidates. Tag invalidations are
+    tracked in the global fondat.cache.tags object.
+
+    If a bulkhead is specified, the operation is executed within it; if the bulkhead rejects
+    the call, ServiceUnavailableError is raised and an "operation_rejections" counter is
+    recorded. Time waiting to enter the bulkhead is recorded in an "operation_bulkhead_wait"
+    histogram; upon entry and exit, the bulkhead's executions in progress and waiting to
+    start are recorded in "operation_bulkhead_active" and "operation_bulkhead_waiting"
+    gauges. A bulkhead can be shared by operations to limit their combined concurrency.
+
+    If a query operation is memoized and a memo scope is on the context stack (see
+    fondat.context.memo_scope), calls with identical arguments within the scope are executed
+    once; subsequent calls are answered with a copy of the first call's result. The memo key
+    is derived from the resource object, operation name and arguments; calls on different
+    resource objects are not memoized together, as their results can depend on object
+    state. Failed calls are not memoized. An HTTP application pushes a memo scope for each
+    request it handles.
+
+    If a timeout is specified, a deadline is pushed onto the context stack for the duration
+    of the call (see fondat.deadline). The operation enforces any deadline in effect; if it is
+    exceeded, the operation is cancelled and GatewayTimeoutError is raised.
+
+    If an executor is specified, the operation is a regular (non-coroutine) function, which
+    is executed in a managed thread or process pool with the caller's context stack (see
+    fondat.executor); this allows blocking or CPU-bound work without stalling the event loop.
+    A process operation must be defined in a resource class accessible by module and
+    qualified name, and its resource object and arguments must be picklable.
     """
 
     if wrapped is None:
@@ -162,10 +245,20 @@ def operation(
             publish=publish,
             deprecated=deprecated,
             cache=cache,
+            cache_refresh=cache_refresh,
+            cache_expire=cache_expire,
+            cache_tags=cache_tags,
+            invalidates=invalidates,
+            bulkhead=bulkhead,
+            memoize=memoize,
+            timeout=timeout,
+            executor=executor,
         )
 
-    if not asyncio.iscoroutinefunction(wrapped):
+    if executor is None and not asyncio.iscoroutinefunction(wrapped):
         raise TypeError("operation must be a coroutine")
+    if executor is not None and asyncio.iscoroutinefunction(wrapped):
+        raise TypeError("operation with executor must not be a coroutine")
 
     if method is None:
         method = wrapped.__name__
@@ -195,14 +288,186 @@ def operation(
 
     if cache and not is_resource(cache):
         raise TypeError("cache must be a resource")
+    if memoize and type != "query":
+        raise TypeError("only query operations can be memoized")
+    if (cache_refresh is not None or cache_expire is not None or cache_tags) and not cache:
+        raise TypeError("cache_refresh, cache_expire and cache_tags require cache")
+
+    param_names = tuple(p.name for p in params[1:])
+    operation_name = wrapped.__name__
+
+    fondat_operation = types.SimpleNamespace(
+        method=method,
+        type=type,
+        policies=policies,
+        publish=publish,
+        deprecated=deprecated,
+        summary=summary,
+        description=description,
+    )
+
+    inflight: dict[bytes, asyncio.Task] = {}  # cache key hash → executing task
+
+    async def execute(wrapped, instance, args, kwargs, arguments):
+        try:
+            if executor is None:
+                result = await wrapped(*args, **kwargs)
+            else:
+                result = await fondat.executor.run_operation(
+                    executor, wrapped, instance, *args, **kwargs
+                )
+        except fondat.error.Error:
+            raise
+        except ValueError as ve:
+            raise fondat.error.BadRequestError from ve
+        except Exception as ex:
+            raise fondat.error.InternalServerError from ex
+        if invalidates:
+            await fondat.cache.tags.invalidate(invalidates(instance, **(defaults | arguments)))
+        return result
+
+    async def execute_and_cache(wrapped, instance, args, kwargs, arguments, cache_entry):
+        versions = (  # recorded before execution; invalidation during execution makes stale
+            await fondat.cache.tags.versions(cache_tags(instance, **(defaults | arguments)))
+            if cache_tags
+            else None
+        )
+        result = await execute(wrapped, instance, args, kwargs, arguments)
+        value = {"result": JSONCodec.get(returns).encode(result), "time": time.time()}
+        if versions:
+            value["tags"] = versions
+        await cache_entry.put(value)
+        return result
+
+    async def enforced(coroutine):
+        async with fondat.deadline.enforce():
+            return await coroutine
+
+    def detach(coroutine) -> asyncio.Task:
+        """Execute in a task without the caller's deadline, bound by the operation timeout."""
+        with fondat.deadline.clear():
+            if timeout is None:
+                return asyncio.ensure_future(coroutine)
+            with fondat.deadline.push(timeout):
+                return asyncio.ensure_future(enforced(coroutine))
+
+    def single_flight(key, coroutine) -> asyncio.Task:
+        if (task := inflight.get(key)) is not None:
+            coroutine.close()
+            return task
+
+        def done(task):
+            if inflight.get(key) is task:
+                del inflight[key]
+            if not task.cancelled():
+                task.exception()  # retrieved even if all callers were cancelled
+
+        task = detach(coroutine)
+        task.add_done_callback(done)
+        inflight[key] = task
+        return task
+
+    async def invoke(wrapped, instance, args, kwargs, tags, arguments):
+        if fondat_operation.policies:
+            await authorize(fondat_operation.policies)
+        if not cache and not memoize:
+            return await execute(wrapped, instance, args, kwargs, arguments)
+        cache_key = tags | {"arguments": JSONCodec.get(Any).encode(defaults | arguments)}
+        if memoize and (memo := context.memo()) is not None:
+            memo_key = ("fondat.operation", id(instance), hash_json(cache_key))
+            if (memoized := memo.get(memo_key)) is None:
+
+                def done(task):
+                    if task.cancelled() or task.exception():
+                        memo.pop(memo_key, None)  # do not memoize failure
+
+                task = detach(lookup(wrapped, instance, args, kwargs, arguments, cache_key))
+                task.add_done_callback(done)
+                memoized = memo[memo_key] = (instance, task)  # instance retains its id
+            return deepcopy(await asyncio.shield(memoized[1]))
+        return await lookup(wrapped, instance, args, kwargs, arguments, cache_key)
+
+    async def lookup(wrapped, instance, args, kwargs, arguments, cache_key):
+        if not cache:
+            return await execute(wrapped, instance, args, kwargs, arguments)
+        cache_entry = cache[cache_key]
+        with suppress(fondat.error.NotFoundError, DecodeError):
+            cached = await cache_entry.get()
+            if not _cached_result(cached):  # e.g. stored in a previous format; a miss
+                raise fondat.error.NotFoundError
+            age = time.time() - cached["time"]
+            if (cache_expire is None or age < cache_expire) and (
+                "tags" not in cached or await fondat.cache.tags.valid(cached["tags"])
+            ):
+                result = JSONCodec.get(returns).decode(cached["result"])
+                if cache_refresh is not None and age >= cache_refresh:
+                    _logger.debug("refreshing stale cached result")
+                    single_flight(
+                        hash_json(cache_key),
+                        execute_and_cache(
+                            wrapped, instance, args, kwargs, arguments, cache_entry
+                        ),
+                    )
+                _logger.debug("returning cached result")
+                return result
+        task = single_flight(
+            hash_json(cache_key),
+            execute_and_cache(wrapped, instance, args, kwargs, arguments, cache_entry),
+        )
+        return await asyncio.shield(task)
+
+    async def record_bulkhead(tags):
+        for name, value in (
+            ("operation_bulkhead_active", bulkhead.active),
+            ("operation_bulkhead_waiting", bulkhead.waiting),
+        ):
+            await monitor.record(
+                monitor.Measurement._taken(
+                    name=name, tags=tags, type="gauge", value=value, unit=None
+                ),
+                None,
+            )
+
+    async def limit(wrapped, instance, args, kwargs, tags, arguments):
+        if bulkhead is None:
+            return await invoke(wrapped, instance, args, kwargs, tags, arguments)
+        try:
+            async with monitor.timer(
+                name="operation_bulkhead_wait", tags=tags, type="histogram"
+            ):
+                await bulkhead.__aenter__()
+        except fondat.error.errors.ServiceUnavailableError:
+            if monitor.monitors:
+                await monitor.record(
+                    monitor.Measurement(
+                        name="operation_rejections", type="counter", value=1, tags=tags
+                    ),
+                    None,
+                )
+            raise
+        try:
+            if monitor.monitors:
+                await record_bulkhead(tags)
+            return await invoke(wrapped, instance, args, kwargs, tags, arguments)
+        finally:
+            await bulkhead.__aexit__(None, None, None)
+            if monitor.monitors:
+                await record_bulkhead(tags)
+
+    async def measure(wrapped, instance, args, kwargs, tags, arguments):
+        if not monitor.monitors:  # skip measurement when nothing is listening
+            return await limit(wrapped, instance, args, kwargs, tags, arguments)
+        async with monitor.counter(name="operation_invocations", tags=tags, status="status"):
+            async with monitor.timer(name="operation_duration", tags=tags, type="histogram"):
+                return await limit(wrapped, instance, args, kwargs, tags, arguments)
 
     @wrapt.decorator
     async def wrapper(wrapped, instance, args, kwargs):
-        cls = instance.__class__
-        resource_name = f"{cls.__module__}.{cls.__qualname__}"
-        operation = getattr(wrapped, "_fondat_operation")
-        arguments = dict(zip((p.name for p in params[1:]), args)) | kwargs
-        operation_name = wrapped.__name__
+        resource_name = _resource_name(instance.__class__)
+        arguments = kwargs  # not modified; safe to reference
+        if args:
+            arguments = dict(zip(param_names, args))
+            arguments.update(kwargs)
         tags = {"resource": resource_name, "operation": operation_name}
         if _logger.isEnabledFor(logging.DEBUG):
             _logger.debug(
@@ -211,40 +476,27 @@ def operation(
                 operation_name,
                 ", ".join(f"{k}={v}" for k, v in arguments.items()),
             )
-        with context.push(tags | {"context": "fondat.operation", "arguments": arguments}):
-            async with monitor.counter(
-                name="operation_invocations", tags=tags, status="status"
-            ):
-                async with monitor.timer(name="operation_duration", tags=tags):
-                    await authorize(operation.policies)
-                    if cache:
-                        cache_args = JSONCodec.get(Any).encode(defaults | arguments)
-                        cache_entry = cache[tags | {"arguments": cache_args}]
-                        with suppress(fondat.error.NotFoundError):
-                            result = JSONCodec.get(returns).decode(await cache_entry.get())
-                            _logger.debug("returning cached result")
-                            return result
-                    try:
-                        result = await wrapped(*args, **kwargs)
-                    except fondat.error.Error:
-                        raise
-                    except ValueError as ve:
-                        raise fondat.error.BadRequestError from ve
-                    except Exception as ex:
-                        raise fondat.error.InternalServerError from ex
-                    if cache:
-                        await cache_entry.put(JSONCodec.get(returns).encode(result))
-                    return result
-
-    wrapped._fondat_operation = types.SimpleNamespace(
-        method=method,
-        type=type,
-        policies=policies,
-        publish=publish,
-        deprecated=deprecated,
-        summary=summary,
-        description=description,
-    )
+        with (
+            context._push(
+                {
+                    "context": "fondat.operation",
+                    "resource": resource_name,
+                    "operation": operation_name,
+                    "arguments": arguments,
+                }
+            ),
+            fondat.trace.span(f"{resource_name}.{operation_name}", **tags),
+        ):
+            if timeout is not None:
+                with fondat.deadline.push(timeout):
+                    async with fondat.deadline.enforce():
+                        return await measure(wrapped, instance, args, kwargs, tags, arguments)
+            if fondat.deadline.get() is not None:
+                async with fondat.deadline.enforce():
+                    return await measure(wrapped, instance, args, kwargs, tags, arguments)
+            return await measure(wrapped, instance, args, kwargs, tags, arguments)
+
+    wrapped._fondat_operation = fondat_operation
 
     wrapped = validate_arguments(wrapped)
     return wrapper(wrapped)
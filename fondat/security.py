@@ -1,9 +1,19 @@
 """Module for authentication and authorization of resource operations."""
 
-from collections.abc import Callable, Coroutine, Iterable
+import asyncio
+import fondat.context
+
+from collections.abc import Callable, Coroutine, Hashable, Iterable
+from fondat.error import ForbiddenError, UnauthorizedError
+from time import time
 from typing import Any
 
 
+_DECISIONS_SIZE = 10000  # maximum number of decisions cached per policy
+
+_Decision = tuple[type[Exception], tuple] | None  # type and arguments of denial, or None
+
+
 class Scheme:
     """Base class for authentication scheme."""
 
@@ -21,6 +31,9 @@ class Policy:
     Parameters and attributes:
     • schemes: authentication schemes that must be satisfied
     • rules: authorization rules that must pass
+    • principal: function that returns the identity of the principal to cache decisions for
+    • expire: time in seconds to cache decisions for a principal  [memo scope only]
+    • concurrent: evaluate authorization rules concurrently
 
     If schemes is None, then authenticaton is not applicable. If schemes is empty, then the
     policy allows access without authentication.
@@ -30,17 +43,32 @@ class Policy:
 
     • UnauthorizedError: user could not be authenticated (misnomer)
     • ForbiddenError: user is authenticated and is denied access
+
+    If a principal function is provided, it is called when the policy is applied to obtain a
+    hashable identity of the principal (typically from the context stack), and the policy's
+    decision for that principal is cached: for the lifetime of the current memo scope (see
+    fondat.context.memo_scope), and if expire is specified, for that amount of time across
+    scopes. Only security decisions are cached; any other exception raised by a rule is not.
+    Rules must therefore depend only on the principal for their decisions to be cached.
     """
 
-    __slots__ = {"schemes", "rules"}
+    __slots__ = {"schemes", "rules", "principal", "expire", "concurrent", "_decisions"}
 
     def __init__(
         self,
         schemes: Iterable[Scheme] | None = None,
         rules: Iterable[Callable[[], Coroutine[Any, Any, Any]]] | None = None,
+        *,
+        principal: Callable[[], Hashable] | None = None,
+        expire: int | float | None = None,
+        concurrent: bool = False,
     ):
         self.schemes = schemes
         self.rules = rules or ()
+        self.principal = principal
+        self.expire = expire
+        self.concurrent = concurrent
+        self._decisions: dict[Hashable, tuple[_Decision, float]] = {}
 
     async def apply(self):
         """
@@ -48,7 +76,51 @@ class Policy:
 
         When a security policy is applied, authorization rules are evaluated in the order
         specified. The first exception encountered is raised immediately, ceasing further
-        evaluation.
+        evaluation. If rules are evaluated concurrently, then upon the first exception
+        remaining rules are cancelled, and the exception of the earliest rule in order that
+        failed is raised.
         """
-        for rule in self.rules:
-            await rule()
+        if self.principal is None:
+            return await self._evaluate()
+        principal = self.principal()
+        memo = fondat.context.memo()
+        memo_key = ("fondat.security.Policy", id(self), principal)
+        if memo is not None and memo_key in memo:
+            decision = memo[memo_key]
+        elif self.expire and (cached := self._decisions.get(principal)) and cached[1] > time():
+            decision = cached[0]
+        else:
+            try:
+                await self._evaluate()
+                decision = None
+            except (ForbiddenError, UnauthorizedError) as se:
+                decision = (type(se), se.args)
+            if memo is not None:
+                memo[memo_key] = decision
+            if self.expire:
+                self._decisions.pop(principal, None)
+                while len(self._decisions) >= _DECISIONS_SIZE:
+                    del self._decisions[next(iter(self._decisions))]  # oldest
+                self._decisions[principal] = (decision, time() + self.expire)
+        if decision is not None:
+            exception_type, args = decision
+            raise exception_type(*args)  # new instance; raising mutates traceback and context
+
+    async def _evaluate(self):
+        if not self.concurrent:
+            for rule in self.rules:
+                await rule()
+            return
+        tasks = [asyncio.ensure_future(rule()) for rule in self.rules]
+        if not tasks:
+            return
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        for task in tasks:
+            if not task.cancelled() and (exception := task.exception()):
+                raise exception
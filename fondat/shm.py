@@ -0,0 +1,209 @@
+"""
+Module to cache values in memory shared between processes on a host.
+
+Entries are stored in a memory-mapped file, which is organized as a hash table with a fixed
+number of fixed-size slots. Processes that map the same file share the same entries. Access
+to the table is serialized between processes with file locks.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import mmap
+import os
+import struct
+import time
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from fondat.cache import JSON, hash_key
+from fondat.error import NotFoundError, errors
+from fondat.http import AsBody
+from fondat.resource import mutation, operation, resource
+from typing import Annotated
+
+
+_MAGIC = b"fondatc1"
+_HEADER = struct.Struct("<8sII")  # magic, slots, slot size
+_SLOT = struct.Struct("<B32sdI")  # state, key digest, time stored, value length
+
+_EMPTY = 0
+_USED = 1
+_DELETED = 2
+
+
+@resource
+class SharedMemoryCache:
+    """
+    Cache resource that stores entries in memory shared between processes.
+
+    Parameters and attributes:
+    • path: path of file to map into memory
+    • slots: number of slots in the hash table
+    • slot_size: size of each slot in bytes, including a 45-byte slot header
+    • expire: time to expire entries in seconds  [unlimited]
+    • probe: number of slots to probe for an entry
+
+    Keys are JSON values or bytes; values are JSON values, stored as encoded JSON. A key is
+    hashed to a slot, and an entry is stored in the first available slot of the slots probed
+    from there. If no slot is available, the oldest entry among them is evicted. An entry
+    whose encoded value does not fit in a slot cannot be stored.
+
+    The file is created and initialized if it does not exist, or if it was initialized with a
+    different number or size of slots. All processes sharing a cache must use the same path,
+    number of slots and slot size. The file is reopened in a process forked after use, so
+    that locks are held per process.
+    """
+
+    @resource
+    class EntryResource:
+        """
+        Represents an entry in a shared memory cache.
+
+        Parameters:
+        • cache: cache where entry resides
+        • key: entry key in cache
+        """
+
+        def __init__(self, cache: SharedMemoryCache, key: JSON | bytes):
+            self.cache = cache
+            self.digest = hash_key(key)
+
+        @operation
+        async def get(self) -> JSON:
+            """Get entry value."""
+            with self.cache._lock(fcntl.LOCK_SH) as table:
+                offset = self.cache._find(table, self.digest)
+                if offset is None:
+                    raise NotFoundError
+                _, _, _, length = _SLOT.unpack_from(table, offset)
+                start = offset + _SLOT.size
+                return json.loads(table[start : start + length])
+
+        @operation
+        async def put(self, value: Annotated[JSON, AsBody]) -> None:
+            """Store entry value."""
+            encoded = json.dumps(value, separators=(",", ":")).encode()
+            if len(encoded) > self.cache.slot_size - _SLOT.size:
+                raise errors.InsufficientStorageError
+            with self.cache._lock(fcntl.LOCK_EX) as table:
+                offset = self.cache._vacancy(table, self.digest)
+                start = offset + _SLOT.size
+                table[start : start + len(encoded)] = encoded
+                _SLOT.pack_into(table, offset, _USED, self.digest, time.time(), len(encoded))
+
+        @operation
+        async def delete(self) -> None:
+            """Delete entry."""
+            with self.cache._lock(fcntl.LOCK_EX) as table:
+                offset = self.cache._find(table, self.digest)
+                if offset is None:
+                    raise NotFoundError
+                table[offset] = _DELETED
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        slots: int = 4096,
+        slot_size: int = 4096,
+        expire: int | float | None = None,
+        probe: int = 8,
+    ):
+        if slot_size <= _SLOT.size:
+            raise ValueError(f"slot size must be greater than {_SLOT.size}")
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.expire = expire
+        self.probe = min(probe, slots)
+        self._pid = None
+        self._fd = None
+        self._mmap = None
+
+    def _open(self) -> None:
+        size = _HEADER.size + self.slots * self.slot_size
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                header = os.pread(fd, _HEADER.size, 0)
+                if (
+                    os.fstat(fd).st_size != size
+                    or header != _HEADER.pack(_MAGIC, self.slots, self.slot_size)
+                ):
+                    os.ftruncate(fd, 0)  # discard incompatible table
+                    os.ftruncate(fd, size)
+                    os.pwrite(fd, _HEADER.pack(_MAGIC, self.slots, self.slot_size), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            self._mmap = mmap.mmap(fd, size)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        self._pid = os.getpid()
+
+    def close(self) -> None:
+        """Unmap and close the file. It is reopened on next use."""
+        if self._mmap is not None:
+            self._mmap.close()
+            os.close(self._fd)
+        self._pid = self._fd = self._mmap = None
+
+    @contextmanager
+    def _lock(self, operation: int) -> Iterator[mmap.mmap]:
+        if self._pid != os.getpid():  # first use, or forked since
+            self.close()
+            self._open()
+        fcntl.flock(self._fd, operation)
+        try:
+            yield self._mmap
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _offsets(self, digest: bytes) -> Iterator[int]:
+        index = int.from_bytes(digest[:8], "little") % self.slots
+        for n in range(self.probe):
+            yield _HEADER.size + ((index + n) % self.slots) * self.slot_size
+
+    def _expired(self, stored: float, now: float) -> bool:
+        return self.expire is not None and stored + self.expire <= now
+
+    def _find(self, table: mmap.mmap, digest: bytes) -> int | None:
+        """Return the offset of the slot containing an unexpired entry, or None."""
+        now = time.time()
+        for offset in self._offsets(digest):
+            state, key, stored, _ = _SLOT.unpack_from(table, offset)
+            if state == _EMPTY:
+                return None
+            if state == _USED and key == digest:
+                return None if self._expired(stored, now) else offset
+        return None
+
+    def _vacancy(self, table: mmap.mmap, digest: bytes) -> int:
+        """Return the offset of the slot in which to store an entry."""
+        now = time.time()
+        vacant = None
+        oldest = None
+        for offset in self._offsets(digest):
+            state, key, stored, _ = _SLOT.unpack_from(table, offset)
+            if state == _USED and key == digest:
+                return offset  # replace existing entry
+            if state == _EMPTY:
+                return vacant if vacant is not None else offset
+            if vacant is None and (state == _DELETED or self._expired(stored, now)):
+                vacant = offset
+            if state == _USED and (oldest is None or stored < oldest[1]):
+                oldest = (offset, stored)
+        return vacant if vacant is not None else oldest[0]
+
+    @mutation
+    async def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock(fcntl.LOCK_EX) as table:
+            for n in range(self.slots):
+                table[_HEADER.size + n * self.slot_size] = _EMPTY
+
+    def __getitem__(self, key: JSON | bytes) -> SharedMemoryCache.EntryResource:
+        return self.EntryResource(self, key)
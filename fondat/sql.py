@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import builtins
+import contextvars
+import fondat.cache
 import fondat.error
 import fondat.patch
 import fondat.security
@@ -16,7 +19,7 @@ from collections.abc import AsyncIterator, Iterable, Mapping
 from contextlib import AbstractAsyncContextManager, suppress
 from dataclasses import dataclass, is_dataclass
 from fondat.cache import CacheResource, hash_json
-from fondat.codec import BinaryCodec, DecodeError, JSONCodec
+from fondat.codec import BinaryCodec, DecodeError, JSONCodec, StringCodec
 from fondat.error import BadRequestError, NotFoundError
 from fondat.pagination import Page, PaginationError
 from fondat.patch import json_merge_patch
@@ -566,6 +569,84 @@ class Index:
         return stmt
 
 
+class RowLoader(Generic[Model]):
+    """
+    Batches reads of rows by primary key into single queries.
+
+    Parameters:
+    • table: table where rows are located
+    • delay: time in seconds to collect reads before querying  [next event loop iteration]
+    • size: maximum number of primary keys to query in a single statement
+
+    Reads requested in the same event loop iteration (or within the delay) are resolved with
+    a query that selects all requested rows by primary key. Requests for the same primary key
+    share a single result.
+
+    Each query is executed in its own transaction, in a new context that is independent of the
+    requesting callers; it is not subject to any caller's deadline, trace span or principal.
+    Consequently, reads through a loader do not observe changes made in a caller's open
+    transaction that are not yet committed; to read a row within a transaction, read it
+    from the table directly.
+    """
+
+    def __init__(self, table: Table[Model], delay: float = 0, size: int = 500):
+        self.table = table
+        self.delay = delay
+        self.size = size
+        self._pending: dict[Any, asyncio.Future] | None = None
+        self._tasks = set()
+
+    async def load(self, pk: Any) -> Model | None:
+        """Return the row with the specified primary key, or None if not found."""
+        if self._pending is None:
+            self._pending = {}
+            loop = asyncio.get_running_loop()
+            if self.delay:
+                loop.call_later(self.delay, self._dispatch, context=contextvars.Context())
+            else:
+                loop.call_soon(self._dispatch, context=contextvars.Context())
+        if (future := self._pending.get(pk)) is None:
+            future = self._pending[pk] = asyncio.get_running_loop().create_future()
+        return await asyncio.shield(future)
+
+    def _dispatch(self):
+        pending, self._pending = self._pending, None
+        pks = list(pending)
+        for n in range(0, len(pks), self.size):
+            batch = {pk: pending[pk] for pk in pks[n : n + self.size]}
+            task = asyncio.ensure_future(self._fetch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            task.add_done_callback(partial(self._done, batch))
+
+    def _done(self, batch: dict[Any, asyncio.Future], task: asyncio.Task):
+        for future in batch.values():
+            future.cancel()  # unresolved if fetch did not complete (e.g. was cancelled)
+
+    async def _fetch(self, batch: dict[Any, asyncio.Future]):
+        pk_type = self.table.columns[self.table.pk]
+        try:
+            async with self.table.database.transaction():
+                rows = {
+                    row[self.table.pk]: self.table.model(**row)
+                    async for row in self.table.select(
+                        where=Expression(
+                            f"{self.table.pk} IN (",
+                            Expression.join((Param(pk, pk_type) for pk in batch), ", "),
+                            ")",
+                        )
+                    )
+                }
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for pk, future in batch.items():
+            if not future.done():
+                future.set_result(rows.get(pk))
+
+
 @resource
 class TableResource(Generic[Model]):
     """
@@ -574,14 +655,21 @@ class TableResource(Generic[Model]):
     Parameters:
     • table: table object being represented by resource
     • cache: resource to cache rows
+    • loader: batches reads of rows by primary key
     """
 
-    def __init__(self, table: Table[Model], cache: CacheResource | None = None):
+    def __init__(
+        self,
+        table: Table[Model],
+        cache: CacheResource | None = None,
+        loader: RowLoader[Model] | None = None,
+    ):
         self.table = table
         self.cache = cache
+        self.loader = loader
 
     def __getitem__(self, pk: Any) -> RowResource[Model]:
-        return RowResource(table=self.table, pk=pk, cache=self.cache)
+        return RowResource(table=self.table, pk=pk, cache=self.cache, loader=self.loader)
 
     @operation
     async def get(
@@ -618,18 +706,22 @@ class TableResource(Generic[Model]):
         Patch body is an iterable of JSON Merge Patch documents; each document must
         contain the primary key of the row to patch.
         """
+        tags = {table_tag(self.table)}
         async with self.table.database.transaction():
             for doc in body:
                 pk = doc.get(self.table.pk)
                 if pk is None:
                     raise ValidationError("missing primary key")
                 pk = JSONCodec.get(self.table.columns[self.table.pk]).decode(pk)
+                row = self[pk]
+                tags.add(row._tag)
                 try:
-                    await self[pk].patch({k: v for k, v in doc.items() if k != self.table.pk})
+                    await row._patch({k: v for k, v in doc.items() if k != self.table.pk})
                 except NotFoundError:
                     new = JSONCodec.get(self.table.model).decode(doc)
                     validate(new, self.table.model)
                     await self.table.insert(new)
+        await fondat.cache.tags.invalidate(tags)  # after commit; readers cannot cache old rows
 
     @query
     async def find_pks(self, pks: set[Any]) -> list[Model]:
@@ -651,6 +743,16 @@ class TableResource(Generic[Model]):
             ]
 
 
+def table_tag(table: Table) -> str:
+    """Return the cache tag that identifies a table."""
+    return table.qualname
+
+
+def row_tag(table: Table, pk: Any) -> str:
+    """Return the cache tag that identifies a row in a table."""
+    return f"{table.qualname}[{StringCodec.get(table.columns[table.pk]).encode(pk)}]"
+
+
 @resource
 class RowResource(Generic[Model]):
     """
@@ -660,11 +762,29 @@ class RowResource(Generic[Model]):
     • table: table where row is located
     • pk: primary key value of row
     • cache: resource to cache rows
+    • loader: batches reads of rows by primary key
+
+    If a loader is specified, rows are read through it; concurrent reads of rows in the same
+    table are resolved with a single query, avoiding a query per row. Reads through a loader
+    do not observe uncommitted changes in the caller's transaction (see RowLoader).
+
+    A cached row is tagged with the row's cache tag (see `row_tag`); invalidating the tag
+    through `fondat.cache.tags` makes the cached row stale. Mutating the row invalidates the
+    row and table tags (see `table_tag`), allowing cached operation results tagged with them
+    to be invalidated.
     """
 
-    def __init__(self, table: Table[Model], pk: Any, cache: CacheResource | None = None):
+    def __init__(
+        self,
+        table: Table[Model],
+        pk: Any,
+        cache: CacheResource | None = None,
+        loader: RowLoader[Model] | None = None,
+    ):
         self.table = table
         self.pk = pk
+        self.loader = loader
+        self._tag = row_tag(table, pk)
         self._cache_entry = (
             cache[
                 hash_json(
@@ -679,18 +799,47 @@ class RowResource(Generic[Model]):
             else None
         )
 
+    async def _cache_get(self) -> Model:
+        cached = await self._cache_entry.get()
+        if not (
+            isinstance(cached, dict)
+            and isinstance(cached.get("tags"), dict)
+            and "row" in cached
+            and await fondat.cache.tags.valid(cached["tags"])
+        ):
+            raise NotFoundError  # stale, or stored in a previous format
+        try:
+            return JSONCodec.get(self.table.model).decode(cached["row"])
+        except DecodeError as de:
+            raise NotFoundError from de
+
+    async def _cache_put(self, row: Model, versions: dict[str, int]) -> None:
+        await self._cache_entry.put(
+            {"row": JSONCodec.get(self.table.model).encode(row), "tags": versions}
+        )
+
+    async def _read(self) -> Model | None:
+        if self.loader:
+            return await self.loader.load(self.pk)
+        async with self.table.database.transaction():
+            return await self.table.read(self.pk)
+
+    async def _invalidate(self) -> dict[str, int]:
+        await fondat.cache.tags.invalidate((table_tag(self.table), self._tag))
+        return await fondat.cache.tags.versions((self._tag,))
+
     @operation
     async def get(self) -> Model:
         """Get row from table."""
         if self._cache_entry:
             with suppress(NotFoundError):
-                return await self._cache_entry.get()
-        async with self.table.database.transaction():
-            row = await self.table.read(self.pk)
+                return await self._cache_get()
+            versions = await fondat.cache.tags.versions((self._tag,))
+        row = await self._read()
         if not row:
             raise NotFoundError
         if self._cache_entry:
-            await self._cache_entry.put(row)
+            await self._cache_put(row, versions)
         return row
 
     @operation
@@ -700,40 +849,47 @@ class RowResource(Generic[Model]):
             raise ValidationError("primary key mismatch")
         async with self.table.database.transaction():
             await self.table.upsert(value)
+        versions = await self._invalidate()
         if self._cache_entry:
-            await self._cache_entry.put(value)
+            await self._cache_put(value, versions)
+
+    async def _patch(self, body: dict[str, Any]) -> Model:
+        """Modify row in the transaction in effect, returning the modified row."""
+        if self.table.pk in body:
+            raise ValidationError(f"cannot patch field: {self.table.pk}")
+        old = await self.table.read(self.pk)
+        if not old:
+            raise NotFoundError
+        try:
+            new = json_merge_patch(value=old, type=self.table.model, patch=body)
+        except DecodeError as de:
+            raise BadRequestError from de
+        validate(new, self.table.model)
+        if old != new:
+            stmt = Expression(f"UPDATE {self.table.name} SET ")
+            updates = []
+            for name, python_type in self.table.columns.items():
+                ofield = getattr(old, name)
+                nfield = getattr(new, name)
+                if ofield != nfield:
+                    updates.append(Expression(f"{name} = ", Param(nfield, python_type)))
+            stmt += Expression.join(updates, ", ")
+            stmt += Expression(
+                f" WHERE {self.table.pk} = ",
+                Param(self.pk, self.table.columns[self.table.pk]),
+                ";",
+            )
+            await self.table.database.execute(stmt)
+        return new
 
     @operation
     async def patch(self, body: dict[str, Any]):
         """Modify row. Patch body is a JSON Merge Patch document."""
         async with self.table.database.transaction():
-            if self.table.pk in body:
-                raise ValidationError(f"cannot patch field: {self.table.pk}")
-            old = await self.table.read(self.pk)
-            if not old:
-                raise NotFoundError
-            try:
-                new = json_merge_patch(value=old, type=self.table.model, patch=body)
-            except DecodeError as de:
-                raise BadRequestError from de
-            validate(new, self.table.model)
-            if old != new:
-                stmt = Expression(f"UPDATE {self.table.name} SET ")
-                updates = []
-                for name, python_type in self.table.columns.items():
-                    ofield = getattr(old, name)
-                    nfield = getattr(new, name)
-                    if ofield != nfield:
-                        updates.append(Expression(f"{name} = ", Param(nfield, python_type)))
-                stmt += Expression.join(updates, ", ")
-                stmt += Expression(
-                    f" WHERE {self.table.pk} = ",
-                    Param(self.pk, self.table.columns[self.table.pk]),
-                    ";",
-                )
-                await self.table.database.execute(stmt)
-            if self._cache_entry:
-                await self._cache_entry.put(new)
+            new = await self._patch(body)
+        versions = await self._invalidate()  # after commit; readers cannot cache old row
+        if self._cache_entry:
+            await self._cache_put(new, versions)
 
     @operation
     async def delete(self) -> None:
@@ -743,14 +899,17 @@ class RowResource(Generic[Model]):
                 await self._cache_entry.delete()
         async with self.table.database.transaction():
             await self.table.delete(self.pk)
+        await fondat.cache.tags.invalidate((table_tag(self.table), self._tag))
 
     @query
     async def exists(self) -> bool:
         """Return if row exists."""
         if self._cache_entry:
             with suppress(NotFoundError):
-                await self._cache_entry.get()
+                await self._cache_get()
                 return True
+        if self.loader:
+            return await self.loader.load(self.pk) is not None
         where = Expression(
             f"{self.table.pk} = ", Param(self.pk, self.table.columns[self.table.pk])
         )
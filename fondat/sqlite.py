@@ -1,12 +1,18 @@
-"""Module to manage data in a SQLite database."""
+"""Module to manage data in a SQLite database, and to cache values in it."""
 
 import aiosqlite
 import asyncio
 import contextvars
+import fondat.cache
 import fondat.codec
+import fondat.deadline
+import fondat.error
 import fondat.sql
+import fondat.trace
+import json
 import logging
 import sqlite3
+import time
 import types
 import typing
 import uuid
@@ -14,11 +20,14 @@ import uuid
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from fondat.codec import Codec, DecodeError, EncodeError
+from fondat.error import NotFoundError
+from fondat.http import AsBody
+from fondat.resource import mutation, operation, resource
 from fondat.sql import Expression, Param
 from fondat.types import is_optional, is_subclass, literal_values, strip_annotations
 from fondat.validation import validate
 from types import NoneType
-from typing import Any, Literal, TypeVar
+from typing import Annotated, Any, Literal, TypeVar
 
 
 _logger = logging.getLogger(__name__)
@@ -226,6 +235,10 @@ class Database(fondat.sql.Database):
 
     Parameter:
     • path: path to SQLite database file
+
+    Statements are executed within any deadline in effect (see fondat.deadline); a statement
+    that exceeds the deadline is interrupted. Each statement executed is traced in a
+    "sql.execute" span (see fondat.trace).
     """
 
     __slots__ = {"path", "_conn", "_txn"}
@@ -305,7 +318,15 @@ class Database(fondat.sql.Database):
                     args.append(SQLiteCodec.get(fragment.type).encode(fragment.value))
                 case _:
                     raise ValueError(f"unexpected fragment: {fragment}")
-        results = await self._conn.get().execute("".join(text), args)
+        connection = self._conn.get()
+        text = "".join(text)
+        try:
+            with fondat.trace.span("sql.execute", statement=text):
+                async with fondat.deadline.enforce():
+                    results = await connection.execute(text, args)
+        except (fondat.error.errors.GatewayTimeoutError, asyncio.CancelledError):
+            await connection.interrupt()  # statement continues in thread unless interrupted
+            raise
         if result is not None:  # expecting a result
             return _Results[T](statement, result, aiter(results))
 
@@ -341,3 +362,209 @@ class Table(fondat.sql.Table[Model]):
             ";",
         )
         await self.database.execute(stmt)
+
+
+@resource
+class SQLiteCache:
+    """
+    Cache resource that stores entries in a SQLite database table, which persist across
+    process restarts.
+
+    Parameters and attributes:
+    • database: database in which to store entries
+    • table: name of table to store entries
+    • expire: time to expire entries in seconds  [unlimited]
+    • size: maximum number of entries to store  [unlimited]
+    • cleanup: number of entries stored between cleanups
+
+    Keys are JSON values or bytes, which are stored as hash values; values are JSON values,
+    stored as encoded JSON. The table must be created by calling the create method before the
+    cache is used.
+
+    Expired entries are not returned, but remain in the table until cleanup. The times that
+    entries are read are recorded in memory, and written in batches during cleanup. Cleanup
+    runs after every specified number of entries are stored; it deletes expired entries and,
+    if there are more entries than the maximum size, the least recently used entries.
+
+    Tagged values (e.g. cached rows and operation results) remain valid across restarts,
+    unless their tags are invalidated. Tag invalidations are tracked in process memory by
+    default; for invalidations to also survive restarts, store them in a persistent cache
+    resource (see fondat.cache.Tags).
+    """
+
+    @resource
+    class EntryResource:
+        """
+        Represents an entry in a SQLite cache.
+
+        Parameters:
+        • cache: cache where entry resides
+        • key: entry key in cache
+        """
+
+        def __init__(self, cache: "SQLiteCache", key: fondat.cache.JSON | bytes):
+            self.cache = cache
+            self.key = fondat.cache.hash_key(key)
+
+        @operation
+        async def get(self) -> fondat.cache.JSON:
+            """Get entry value."""
+            row = await self.cache._read(self.key)
+            if row is None:
+                raise NotFoundError
+            self.cache._accessed[self.key] = time.time()
+            return json.loads(row["value"])
+
+        @operation
+        async def put(self, value: Annotated[fondat.cache.JSON, AsBody]) -> None:
+            """Store entry value."""
+            now = time.time()
+            expires = now + self.cache.expire if self.cache.expire is not None else None
+            async with self.cache.database.transaction():
+                await self.cache.database.execute(
+                    Expression(
+                        f"INSERT INTO {self.cache.table} (key, value, expires, accessed) ",
+                        "VALUES (",
+                        Param(self.key, bytes),
+                        ", ",
+                        Param(json.dumps(value, separators=(",", ":")), str),
+                        ", ",
+                        Param(expires, float | None),
+                        ", ",
+                        Param(now, float),
+                        ") ON CONFLICT (key) DO UPDATE SET value = excluded.value, ",
+                        "expires = excluded.expires, accessed = excluded.accessed;",
+                    )
+                )
+            self.cache._accessed.pop(self.key, None)
+            self.cache._stored += 1
+            if self.cache._stored >= self.cache.cleanup:
+                await self.cache.clean()
+
+        @operation
+        async def delete(self) -> None:
+            """Delete entry."""
+            async with self.cache.database.transaction():
+                if await self.cache._read(self.key) is None:
+                    raise NotFoundError
+                await self.cache.database.execute(
+                    Expression(
+                        f"DELETE FROM {self.cache.table} WHERE key = ",
+                        Param(self.key, bytes),
+                        ";",
+                    )
+                )
+            self.cache._accessed.pop(self.key, None)
+
+    def __init__(
+        self,
+        database: Database,
+        table: str = "fondat_cache",
+        expire: int | float | None = None,
+        size: int | None = None,
+        cleanup: int = 1000,
+    ):
+        self.database = database
+        self.table = table
+        self.expire = expire
+        self.size = size
+        self.cleanup = cleanup
+        self._accessed: dict[bytes, float] = {}  # key: time last read
+        self._stored = 0  # entries stored since last cleanup
+
+    async def create(self) -> None:
+        """
+        Create the cache table, if it does not already exist, and set the database to use
+        write-ahead logging, so that cache reads are not blocked by writes. Must be called
+        outside of a database transaction context.
+        """
+        async with self.database.connection():
+            cursor = await self.database._conn.get().execute("PRAGMA journal_mode=WAL;")
+            await cursor.close()
+            async with self.database.transaction():
+                await self.database.execute(
+                    Expression(
+                        f"CREATE TABLE IF NOT EXISTS {self.table} (key BLOB PRIMARY KEY, ",
+                        "value TEXT NOT NULL, expires REAL, accessed REAL NOT NULL);",
+                    )
+                )
+                for column in ("expires", "accessed"):
+                    await self.database.execute(
+                        Expression(
+                            f"CREATE INDEX IF NOT EXISTS {self.table}_{column} ",
+                            f"ON {self.table} ({column});",
+                        )
+                    )
+
+    async def _read(self, key: bytes) -> dict[str, Any] | None:
+        async with self.database.transaction():
+            results = await self.database.execute(
+                Expression(
+                    f"SELECT value FROM {self.table} WHERE key = ",
+                    Param(key, bytes),
+                    " AND (expires IS NULL OR expires > ",
+                    Param(time.time(), float),
+                    ");",
+                ),
+                typing.TypedDict("Result", {"value": str}),
+            )
+            return await anext(results, None)
+
+    async def clean(self) -> None:
+        """
+        Write recorded read times, delete expired entries, and delete the least recently used
+        entries in excess of the maximum size.
+        """
+        accessed, self._accessed = self._accessed, {}
+        self._stored = 0
+        async with self.database.transaction():
+            for key, time_ in accessed.items():
+                await self.database.execute(
+                    Expression(
+                        f"UPDATE {self.table} SET accessed = ",
+                        Param(time_, float),
+                        " WHERE key = ",
+                        Param(key, bytes),
+                        " AND accessed < ",
+                        Param(time_, float),
+                        ";",
+                    )
+                )
+            await self.database.execute(
+                Expression(
+                    f"DELETE FROM {self.table} WHERE expires <= ",
+                    Param(time.time(), float),
+                    ";",
+                )
+            )
+            if self.size is not None:
+                count = await self.count()
+                if count > self.size:
+                    await self.database.execute(
+                        Expression(
+                            f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM ",
+                            f"{self.table} ORDER BY accessed LIMIT ",
+                            Param(count - self.size, int),
+                            ");",
+                        )
+                    )
+
+    async def count(self) -> int:
+        """Return the number of entries stored, including expired entries not yet deleted."""
+        async with self.database.transaction():
+            results = await self.database.execute(
+                Expression(f"SELECT COUNT(*) AS count FROM {self.table};"),
+                typing.TypedDict("Result", {"count": int}),
+            )
+            return (await anext(results))["count"]
+
+    @mutation
+    async def clear(self) -> None:
+        """Remove all entries from the cache."""
+        async with self.database.transaction():
+            await self.database.execute(Expression(f"DELETE FROM {self.table};"))
+        self._accessed.clear()
+        self._stored = 0
+
+    def __getitem__(self, key: fondat.cache.JSON | bytes) -> "SQLiteCache.EntryResource":
+        return self.EntryResource(self, key)
@@ -1,5 +1,8 @@
 """Module for binary content streaming."""
 
+import fondat.deadline
+import fondat.trace
+
 from asyncio import LimitOverrunError
 from collections.abc import AsyncIterator
 from contextlib import suppress
@@ -132,6 +135,9 @@ class Reader:
     • limit: buffer size limit
 
     If buffer size limit is exceeded during read operations, LimitOverrunError is raised.
+
+    Reads from the stream are performed within any deadline in effect (see fondat.deadline),
+    and are traced in "stream.read" spans (see fondat.trace).
     """
 
     def __init__(self, stream: Stream, limit: int | None = None):
@@ -148,7 +154,9 @@ class Reader:
 
     async def _read(self) -> None:
         try:
-            self._buffer += await anext(self.stream)
+            with fondat.trace.span("stream.read"):
+                async with fondat.deadline.enforce():
+                    self._buffer += await anext(self.stream)
             if self.limit and len(self._buffer) > self.limit:
                 raise LimitOverrunError
         except StopAsyncIteration:
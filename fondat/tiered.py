@@ -0,0 +1,145 @@
+"""
+Module to compose cache resources in tiers.
+
+A TieredCache keeps frequently used entries in a fast first tier (e.g. a MemoryResource in
+process memory) and the remainder in a larger, slower second tier (e.g. a SQLiteCache in a
+database). It can be used anywhere a cache resource is accepted, including as the cache of an
+operation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import fondat.error
+import logging
+
+from fondat.cache import JSON, CacheResource, hash_key
+from fondat.error import NotFoundError
+from fondat.http import AsBody
+from fondat.resource import operation, resource
+from typing import Annotated, Literal
+
+
+_logger = logging.getLogger(__name__)
+
+
+@resource
+class TieredCache:
+    """
+    Cache resource that composes a fast first tier and a larger second tier.
+
+    Parameters and attributes:
+    • l1: first tier cache resource, checked first
+    • l2: second tier cache resource, checked if entry is not found in the first tier
+    • write: when values are stored in the second tier
+    • promote: store entries found in the second tier in the first tier
+
+    Write modes:
+    • "through": values are stored in both tiers before put returns
+    • "behind": values are stored in the first tier before put returns, and in the second
+      tier by a background task; pending writes of the same entry are coalesced
+
+    The background task runs in a new context, independent of the callers whose writes it
+    performs; it is not subject to any caller's deadline, trace span or memo scope.
+
+    Failing to promote an entry to the first tier (e.g. because it is too large) does not fail
+    the read. Failing to write an entry behind to the second tier is logged.
+    """
+
+    @resource
+    class EntryResource:
+        """
+        Represents an entry in a tiered cache.
+
+        Parameters:
+        • cache: cache where entry resides
+        • key: entry key in cache
+        """
+
+        def __init__(self, cache: TieredCache, key: JSON | bytes):
+            self.cache = cache
+            self.key = key
+
+        @operation
+        async def get(self) -> JSON:
+            """Get entry value."""
+            cache = self.cache
+            try:
+                return await cache.l1[self.key].get()
+            except NotFoundError:
+                pass
+            if (pending := cache._pending.get(hash_key(self.key))) is not None:
+                return pending[1]
+            value = await cache.l2[self.key].get()
+            if cache.promote:
+                try:
+                    await cache.l1[self.key].put(value)
+                except fondat.error.Error:
+                    _logger.debug("failed to promote cache entry", exc_info=True)
+            return value
+
+        @operation
+        async def put(self, value: Annotated[JSON, AsBody]) -> None:
+            """Store entry value."""
+            cache = self.cache
+            await cache.l1[self.key].put(value)
+            if cache.write == "through":
+                await cache.l2[self.key].put(value)
+                return
+            cache._pending[hash_key(self.key)] = (self.key, value)
+            if cache._writer is None:  # in new context; not subject to any caller's deadline
+                cache._writer = asyncio.create_task(
+                    cache._write_behind(), context=contextvars.Context()
+                )
+
+        @operation
+        async def delete(self) -> None:
+            """Delete entry."""
+            cache = self.cache
+            found = cache._pending.pop(hash_key(self.key), None) is not None
+            await cache.flush()  # write of entry may be in progress
+            for tier in (cache.l1, cache.l2):
+                try:
+                    await tier[self.key].delete()
+                    found = True
+                except NotFoundError:
+                    pass
+            if not found:
+                raise NotFoundError
+
+    def __init__(
+        self,
+        l1: CacheResource,
+        l2: CacheResource,
+        write: Literal["through", "behind"] = "through",
+        promote: bool = True,
+    ):
+        if write not in {"through", "behind"}:
+            raise ValueError(f"unsupported write mode: {write}")
+        self.l1 = l1
+        self.l2 = l2
+        self.write = write
+        self.promote = promote
+        self._pending: dict[bytes, tuple[JSON, JSON]] = {}  # key hash: (key, value)
+        self._writer: asyncio.Task | None = None
+
+    async def _write_behind(self) -> None:
+        try:
+            while self._pending:
+                digest, (key, value) = next(iter(self._pending.items()))
+                del self._pending[digest]
+                try:
+                    await self.l2[key].put(value)
+                except Exception:
+                    _logger.exception("failed to write cache entry to second tier")
+        finally:
+            self._writer = None
+
+    async def flush(self) -> None:
+        """Wait for pending writes to the second tier to complete."""
+        while self._writer is not None:
+            await asyncio.shield(self._writer)
+
+    def __getitem__(self, key: JSON | bytes) -> TieredCache.EntryResource:
+        return self.EntryResource(self, key)
@@ -0,0 +1,238 @@
+"""
+Module to trace the execution of work in spans.
+
+A span records the start and end time of a unit of work, its parent span, tags that qualify
+it, and its status. A span is pushed onto the execution context stack for the duration of its
+work; spans started within its context are its children. Spans with no parent start a new
+trace.
+
+A global "exporters" object is a list of exporters and an exporter itself. Applications are
+free to add/remove their own exporters to/from this object. Ended spans are buffered, and are
+exported in batches. If there are no exporters, spans are not recorded at all.
+
+Buffered spans are exported once a batch is full, and periodically by a background task,
+which is started by calling the start function, and stopped by calling the stop function;
+stopping exports all buffered spans.
+"""
+
+import asyncio
+import fondat.context as context
+import fondat.executor
+import json
+import logging
+import os
+import time
+
+from collections import deque
+from contextlib import contextmanager, nullcontext, suppress
+from dataclasses import asdict, dataclass, field
+from typing import Any, Literal
+
+
+_logger = logging.getLogger(__name__)
+
+
+Status = Literal["ok", "error"]
+
+
+@dataclass(slots=True)
+class Span:
+    """
+    A span of traced work.
+
+    Attributes:
+    • name: name of the work performed in the span
+    • trace_id: identifies the trace that the span is a part of
+    • span_id: identifies the span
+    • parent_id: identifies the parent span, or None if span is the root of the trace
+    • start: date and time the span started, in seconds since the epoch
+    • end: date and time the span ended, in seconds since the epoch
+    • tags: key-value pairs that qualify the span
+    • status: status of the work upon span end
+    • error: description of the exception raised by the work, if any
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start: float
+    end: float | None = None
+    tags: dict[str, Any] = field(default_factory=dict)
+    status: Status | None = None
+    error: str | None = None
+
+
+class Exporter:
+    """Base class for an exporter of ended spans."""
+
+    async def export(self, spans: list[Span]) -> None:
+        """Export a batch of ended spans."""
+        raise NotImplementedError
+
+
+class Exporters(Exporter, list[Exporter]):
+    """A list of exporters, to which all ended spans are exported."""
+
+    async def export(self, spans: list[Span]) -> None:
+        """Export a batch of ended spans to all exporters."""
+        await asyncio.gather(*(exporter.export(spans) for exporter in self))
+
+
+class MemoryExporter(Exporter):
+    """
+    Exports spans to a buffer in memory.
+
+    Parameters:
+    • size: maximum number of spans to retain; oldest spans are discarded  [unlimited]
+
+    Attributes:
+    • spans: exported spans, oldest first
+    """
+
+    def __init__(self, size: int | None = None):
+        self.spans = deque(maxlen=size)
+
+    async def export(self, spans: list[Span]) -> None:
+        self.spans.extend(spans)
+
+
+class FileExporter(Exporter):
+    """
+    Exports spans to a local file, with each span encoded as a line of JSON.
+
+    Parameters:
+    • path: path of file to append spans to
+
+    The file is written in a managed thread pool, so that exporting does not block the event
+    loop.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = path
+
+    def _write(self, lines: str) -> None:
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(lines)
+
+    async def export(self, spans: list[Span]) -> None:
+        lines = "".join(f"{json.dumps(asdict(span), default=str)}\n" for span in spans)
+        await fondat.executor.run("thread", self._write, lines)
+
+
+exporters = Exporters()
+
+batch_size = 100  # number of ended spans to buffer before exporting
+
+flush_interval = 10  # time in seconds between periodic exports of buffered spans
+
+_buffer: list[Span] = []
+_exports: set[asyncio.Task] = set()
+_flusher: asyncio.Task | None = None
+_NULL = nullcontext()
+
+_EPOCH = time.time() - time.perf_counter()  # span times are measured with performance counter
+
+
+def _id(size: int) -> str:
+    return os.urandom(size).hex()
+
+
+def current() -> Span | None:
+    """Return the span in effect, or None if there is no span in effect."""
+    element = context.last(context="fondat.trace.span")
+    return element["span"] if element is not None else None
+
+
+@contextmanager
+def _span(name: str, tags: dict[str, Any]):
+    parent = current()
+    span = Span(
+        name=name,
+        trace_id=parent.trace_id if parent else _id(16),
+        span_id=_id(8),
+        parent_id=parent.span_id if parent else None,
+        start=_EPOCH + time.perf_counter(),
+        tags=tags,
+    )
+    try:
+        with context.push(context="fondat.trace.span", span=span):
+            yield span
+    except StopAsyncIteration:  # end of iteration, not an error
+        span.status = "ok"
+        raise
+    except BaseException as e:
+        span.status = "error"
+        span.error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        raise
+    else:
+        span.status = "ok"
+    finally:
+        span.end = _EPOCH + time.perf_counter()
+        _end(span)
+
+
+def span(name: str, **tags: Any):
+    """
+    Return a context manager that traces the work performed within its context in a span.
+    Within the context, the span is available as the target of the "with" statement, and
+    through the current function; tags can be added to it during the work.
+
+    Parameters:
+    • name: name of the work performed in the span
+    • tags: key-value pairs that qualify the span
+
+    If there are no exporters, no span is recorded, and the context manager yields None.
+    """
+    if not exporters:
+        return _NULL
+    return _span(name, tags)
+
+
+def _end(span: Span) -> None:
+    _buffer.append(span)
+    if len(_buffer) < batch_size:
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return  # exported upon next flush
+    task = asyncio.create_task(flush())
+    _exports.add(task)
+    task.add_done_callback(_exports.discard)
+
+
+async def flush() -> None:
+    """Export all buffered spans."""
+    global _buffer
+    if not _buffer:
+        return
+    spans, _buffer = _buffer, []
+    try:
+        await exporters.export(spans)
+    except Exception:
+        _logger.exception("error exporting spans")
+
+
+async def _run() -> None:
+    while True:
+        await asyncio.sleep(flush_interval)
+        await flush()
+
+
+def start() -> None:
+    """Start periodic export of buffered spans."""
+    global _flusher
+    if _flusher is None:
+        _flusher = asyncio.create_task(_run())
+
+
+async def stop() -> None:
+    """Stop periodic export, and export all buffered spans."""
+    global _flusher
+    if _flusher is not None:
+        _flusher.cancel()
+        with suppress(asyncio.CancelledError):
+            await _flusher
+        _flusher = None
+    await flush()
@@ -390,8 +390,12 @@ def validate_arguments(callable: Callable):
         if p.kind in {p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD}
     ]
 
+    hints = None  # resolved on first call; forward references may not yet be resolvable
+
     def _validate(instance, args, kwargs):
-        hints = typing.get_type_hints(callable, include_extras=True)
+        nonlocal hints
+        if hints is None:
+            hints = typing.get_type_hints(callable, include_extras=True)
         if instance:
             args = (instance, *args)
         params = {
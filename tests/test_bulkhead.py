@@ -0,0 +1,111 @@
+import asyncio
+import fondat.error
+import fondat.monitor
+import fondat.resource
+import pytest
+
+from fondat.bulkhead import Bulkhead
+from fondat.monitor import Measurement, Monitor
+from fondat.resource import operation, resource
+
+
+async def test_limit():
+    bulkhead = Bulkhead(limit=2)
+    active = []
+
+    async def work():
+        async with bulkhead:
+            active.append(bulkhead.active)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(work() for _ in range(5)))
+    assert max(active) == 2
+    assert bulkhead.active == 0
+    assert bulkhead.waiting == 0
+
+
+async def test_queue_full():
+    bulkhead = Bulkhead(limit=1, queue=1)
+
+    async def work():
+        async with bulkhead:
+            await asyncio.sleep(0.01)
+
+    results = await asyncio.gather(*(work() for _ in range(3)), return_exceptions=True)
+    assert results[:2] == [None, None]
+    assert isinstance(results[2], fondat.error.errors.ServiceUnavailableError)
+
+
+async def test_timeout():
+    bulkhead = Bulkhead(limit=1, timeout=0.01)
+
+    async def work():
+        async with bulkhead:
+            await asyncio.sleep(0.05)
+
+    results = await asyncio.gather(work(), work(), return_exceptions=True)
+    assert results[0] is None
+    assert isinstance(results[1], fondat.error.errors.ServiceUnavailableError)
+    assert bulkhead.waiting == 0
+
+
+def test_invalid_limit():
+    with pytest.raises(ValueError):
+        Bulkhead(limit=0)
+
+
+class ListMonitor(Monitor):
+    def __init__(self):
+        self.measurements = []
+
+    async def record(self, measurement: Measurement):
+        self.measurements.append(measurement)
+
+
+async def test_operation_bulkhead():
+    @resource
+    class Resource:
+        @operation(bulkhead=Bulkhead(limit=1, queue=0))
+        async def get(self) -> None:
+            await asyncio.sleep(0.01)
+
+    r = Resource()
+    monitor = ListMonitor()
+    fondat.monitor.monitors.append(monitor)
+    try:
+        results = await asyncio.gather(r.get(), r.get(), return_exceptions=True)
+    finally:
+        fondat.monitor.monitors.remove(monitor)
+    assert results[0] is None
+    assert isinstance(results[1], fondat.error.errors.ServiceUnavailableError)
+    assert [m.name for m in monitor.measurements if m.name == "operation_rejections"] == [
+        "operation_rejections"
+    ]
+
+
+async def test_operation_bulkhead_gauges():
+    @resource
+    class Resource:
+        @operation(bulkhead=Bulkhead(limit=1))
+        async def get(self) -> None:
+            await asyncio.sleep(0.01)
+
+    r = Resource()
+    monitor = ListMonitor()
+    fondat.monitor.monitors.append(monitor)
+    try:
+        await asyncio.gather(r.get(), r.get())
+    finally:
+        fondat.monitor.monitors.remove(monitor)
+    tags = {"resource": fondat.resource._resource_name(Resource), "operation": "get"}
+
+    def values(name):
+        measurements = [m for m in monitor.measurements if m.name == name]
+        assert all(m.tags == tags for m in measurements)
+        return [m.value for m in measurements]
+
+    assert values("operation_bulkhead_active") == [1, 0, 1, 0]
+    assert sorted(values("operation_bulkhead_waiting")) == [0, 0, 0, 1]
+    waits = values("operation_bulkhead_wait")
+    assert len(waits) == 2
+    assert max(waits) >= 0.01  # second call waited for first
@@ -68,3 +68,78 @@ def test_coroutine_isolation():
         assert count(context.find()) == 0
 
     asyncio.run(run())
+
+
+def test_memo_scope():
+    assert context.memo() is None
+    with context.memo_scope():
+        context.memo()["a"] = 1
+        with context.push(context="foo"):
+            assert context.memo() == {"a": 1}
+            with context.memo_scope():
+                assert context.memo() == {}
+    assert context.memo() is None
+
+
+def test_indexed_lookup():
+    with context.push(context="a", n=1):
+        with context.push(context="b", n=2):
+            with context.push(context="a", n=3):
+                with context.push({"context": ["unhashable"], "n": 4}):
+                    assert context.last(context="a")["n"] == 3
+                    assert context.first(context="a")["n"] == 1
+                    assert context.first(context="b")["n"] == 2
+                    assert context.last(context="a", n=1)["n"] == 1
+                    assert context.first(context="a", n=3)["n"] == 3
+                    assert [v["n"] for v in context.find(context="a")] == [3, 1]
+                    assert context.last(context="c") is None
+                    assert context.first(context="c") is None
+                    assert context.last(context=["unhashable"])["n"] == 4
+                    assert context.first(n=2)["context"] == "b"
+                    assert count(context.find()) == 5
+            assert [v["n"] for v in context.find(context="a")] == [1]
+    assert context.last(context="a") is None
+
+
+async def test_indexed_fork():
+    async def child(n):
+        with context.push(context="child", n=n):
+            await asyncio.sleep(0)
+            return [v["n"] for v in context.find(context="child")]
+
+    with context.push(context="child", n=0):
+        results = await asyncio.gather(child(1), child(2))
+    assert results == [[1, 0], [2, 0]]
+
+
+def test_root_lazy(monkeypatch):
+    import datetime
+    import pickle
+    import uuid
+
+    calls = []
+    uuid4 = uuid.uuid4
+    monkeypatch.setattr(uuid, "uuid4", lambda: calls.append(1) or uuid4())
+    before = datetime.datetime.now(tz=datetime.timezone.utc)
+    with context.push(context="foo"):
+        root = context.last(context="fondat.root")
+        assert calls == []
+        assert isinstance(root["id"], uuid.UUID)
+        assert root["id"] == root["id"]
+        assert calls == [1]
+        assert before <= root["time"] <= datetime.datetime.now(tz=datetime.timezone.utc)
+        assert dict(root) == {"context": "fondat.root", "id": root["id"], "time": root["time"]}
+        assert pickle.loads(pickle.dumps(root)) == dict(root)
+
+
+def test_snapshot_restore():
+    with context.push(context="a"):
+        with context.push(context="b"):
+            snapshot = context.snapshot()
+            selected = context.snapshot(lambda value: value["context"] != "a")
+    assert [value["context"] for value in snapshot] == ["fondat.root", "a", "b"]
+    assert [value["context"] for value in selected] == ["fondat.root", "b"]
+    with context.restore(selected):
+        assert context.last(context="b") is not None
+        assert context.last(context="a") is None
+    assert context.last(context="b") is None
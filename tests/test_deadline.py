@@ -0,0 +1,174 @@
+import asyncio
+import fondat.deadline
+import fondat.error
+import fondat.http
+import pytest
+
+from fondat.resource import operation, resource
+from fondat.stream import Reader, Stream
+
+
+def test_no_deadline():
+    assert fondat.deadline.get() is None
+    assert fondat.deadline.remaining() is None
+
+
+def test_push_never_extends():
+    with fondat.deadline.push(1):
+        deadline = fondat.deadline.get()
+        with fondat.deadline.push(10):
+            assert fondat.deadline.get() == deadline
+        with fondat.deadline.push(0.5):
+            assert fondat.deadline.get() < deadline
+    assert fondat.deadline.get() is None
+
+
+def test_clear():
+    with fondat.deadline.push(1):
+        with fondat.deadline.clear():
+            assert fondat.deadline.get() is None
+            with fondat.deadline.push(10):
+                assert fondat.deadline.remaining() > 9
+        assert fondat.deadline.get() is not None
+
+
+async def test_enforce():
+    with fondat.deadline.push(0.01):
+        with pytest.raises(fondat.error.errors.GatewayTimeoutError):
+            async with fondat.deadline.enforce():
+                await asyncio.sleep(1)
+
+
+async def test_enforce_exceeded():
+    with fondat.deadline.push(0):
+        with pytest.raises(fondat.error.errors.GatewayTimeoutError):
+            async with fondat.deadline.enforce():
+                pass
+
+
+async def test_enforce_other_timeout():
+    with fondat.deadline.push(1):
+        with pytest.raises(TimeoutError):
+            async with fondat.deadline.enforce():
+                raise TimeoutError
+
+
+@resource
+class Resource:
+    @operation(timeout=0.01)
+    async def get(self) -> None:
+        await asyncio.sleep(1)
+
+    @operation
+    async def post(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+
+async def test_operation_timeout():
+    with pytest.raises(fondat.error.errors.GatewayTimeoutError):
+        await Resource().get()
+
+
+async def test_operation_deadline():
+    await Resource().post(0.01)
+    with fondat.deadline.push(0.01):
+        with pytest.raises(fondat.error.errors.GatewayTimeoutError):
+            await Resource().post(1.0)
+
+
+async def test_coalesced_not_bound_by_caller_deadline():
+    from fondat.memory import MemoryResource
+    from typing import Any
+
+    deadlines = []
+
+    @resource
+    class Cached:
+        @operation(cache=MemoryResource(key_type=Any, value_type=Any))
+        async def get(self) -> int:
+            deadlines.append(fondat.deadline.get())
+            await Resource().post(0.05)  # nested operation enforces deadline in effect
+            return 1
+
+    async def hurried():
+        with fondat.deadline.push(0.01):
+            return await Cached().get()
+
+    results = await asyncio.gather(hurried(), Cached().get(), return_exceptions=True)
+    assert isinstance(results[0], fondat.error.errors.GatewayTimeoutError)
+    assert results[1] == 1
+    assert deadlines == [None]
+
+
+async def test_coalesced_bound_by_operation_timeout():
+    from fondat.memory import MemoryResource
+    from typing import Any
+
+    @resource
+    class Cached:
+        @operation(cache=MemoryResource(key_type=Any, value_type=Any), timeout=0.01)
+        async def get(self) -> int:
+            await asyncio.sleep(1)
+            return 1
+
+    with pytest.raises(fondat.error.errors.GatewayTimeoutError):
+        await Cached().get()
+
+
+async def test_refresh_not_bound_by_caller_deadline():
+    from fondat.memory import MemoryResource
+    from typing import Any
+
+    calls = []
+
+    @resource
+    class Cached:
+        @operation(cache=MemoryResource(key_type=Any, value_type=Any), cache_refresh=0)
+        async def get(self) -> int:
+            calls.append(1)
+            await Resource().post(0.05)
+            return len(calls)
+
+    assert await Cached().get() == 1
+    with fondat.deadline.push(0.01):
+        assert await Cached().get() == 1  # stale; refresh started
+    await asyncio.sleep(0.1)
+    assert len(calls) == 2
+    assert await Cached().get() == 2  # refreshed despite caller's deadline
+
+
+class SlowStream(Stream):
+    def __init__(self):
+        super().__init__("application/octet-stream")
+
+    async def __anext__(self):
+        await asyncio.sleep(1)
+        return b"x"
+
+    async def close(self):
+        pass
+
+
+async def test_reader_deadline():
+    with fondat.deadline.push(0.01):
+        with pytest.raises(fondat.error.errors.GatewayTimeoutError):
+            await Reader(SlowStream()).read()
+
+
+async def test_http_filter():
+    @resource
+    class Root:
+        @operation
+        async def get(self) -> str:
+            return str(fondat.deadline.remaining())
+
+    app = fondat.http.Application(Root(), filters=[fondat.http.deadline_filter(timeout=10)])
+    request = fondat.http.Request(method="GET", path="/")
+    response = await app(request)
+    assert 9 < float(await Reader(response.body).read()) <= 10
+    request.headers["Request-Timeout"] = "2"
+    response = await app(request)
+    assert 1 < float(await Reader(response.body).read()) <= 2
+    request.headers["Request-Timeout"] = "20"
+    response = await app(request)
+    assert 9 < float(await Reader(response.body).read()) <= 10
@@ -0,0 +1,107 @@
+import asyncio
+import concurrent.futures
+import fondat.context as context
+import fondat.error
+import fondat.executor
+import os
+import pytest
+import threading
+
+from fondat.resource import operation, resource
+
+
+def describe() -> dict:
+    return {
+        "pid": os.getpid(),
+        "thread": threading.get_ident(),
+        "contexts": [value["context"] for value in context.find()],
+    }
+
+
+async def test_run_thread():
+    with context.push(context="test"):
+        result = await fondat.executor.run("thread", describe)
+    assert result["pid"] == os.getpid()
+    assert result["thread"] != threading.get_ident()
+    assert result["contexts"] == ["test", "fondat.root"]
+
+
+async def test_run_process():
+    with context.push(context="test", unpicklable=lambda: None):
+        with context.push(context="picklable", value=1):
+            result = await fondat.executor.run("process", describe)
+    assert result["pid"] != os.getpid()
+    assert result["contexts"] == ["picklable", "fondat.root"]
+
+
+@resource
+class Resource:
+    def __init__(self, factor: int = 2):
+        self.factor = factor
+
+    @operation(executor="thread")
+    def get(self, value: int) -> dict:
+        return describe() | {"value": value * self.factor}
+
+    @operation(executor="process")
+    def post(self, value: int) -> dict:
+        return describe() | {"value": value * self.factor}
+
+    @operation(executor="thread")
+    def delete(self) -> None:
+        raise ValueError
+
+
+async def test_operation_thread():
+    result = await Resource().get(2)
+    assert result["value"] == 4
+    assert result["thread"] != threading.get_ident()
+    assert result["contexts"][0] == "fondat.operation"
+
+
+async def test_operation_process():
+    result = await Resource(3).post(value=2)
+    assert result["value"] == 6
+    assert result["pid"] != os.getpid()
+    assert result["contexts"][0] == "fondat.operation"
+
+
+async def test_operation_validation():
+    with pytest.raises(fondat.error.BadRequestError):
+        await Resource().get("x")
+    with pytest.raises(fondat.error.BadRequestError):
+        await Resource().post("x")
+    with pytest.raises(fondat.error.BadRequestError):
+        await Resource().delete()
+
+
+def test_operation_executor_coroutine():
+    with pytest.raises(TypeError):
+
+        @resource
+        class R:
+            @operation(executor="thread")
+            async def get(self) -> None:
+                pass
+
+
+async def test_bind_any_executor():
+    loop = asyncio.get_running_loop()
+    with concurrent.futures.ThreadPoolExecutor() as pool:
+        with context.push(context="test"):
+            result = await loop.run_in_executor(pool, fondat.executor.bind(describe))
+    assert result["contexts"] == ["test", "fondat.root"]
+
+
+async def test_bind_process_select():
+    loop = asyncio.get_running_loop()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1) as pool:
+        with context.push(context="secret", token="x"):
+            with context.push(context="test"):
+                call = fondat.executor.bind_process(
+                    describe, select=lambda value: value["context"] != "secret"
+                )
+                result = await loop.run_in_executor(pool, call)
+    assert result["pid"] != os.getpid()
+    assert result["contexts"] == ["test", "fondat.root"]
+
@@ -337,3 +337,31 @@ def test_default_params_in():
     assert isinstance(gpi(Resource.delete), fondat.http.InQuery)
     assert isinstance(gpi(Resource.query), fondat.http.InQuery)
     assert isinstance(gpi(Resource.mutation), fondat.http.InBody)
+
+
+async def test_request_duration():
+    import fondat.monitor
+
+    @resource
+    class Resource:
+        @operation
+        async def get(self) -> str:
+            return "str"
+
+    measurements = []
+
+    class Monitor(fondat.monitor.Monitor):
+        async def record(self, measurement):
+            measurements.append(measurement)
+
+    application = Application(Resource())
+    fondat.monitor.monitors.append(monitor := Monitor())
+    try:
+        response = await application(Request(method="GET", path="/"))
+    finally:
+        fondat.monitor.monitors.remove(monitor)
+    assert response.status == http.HTTPStatus.OK.value
+    names = {m.name: m for m in measurements}
+    assert names["http_request_duration"].type == "histogram"
+    assert names["http_request_duration"].tags == {"method": "get"}
+    assert names["operation_duration"].type == "histogram"
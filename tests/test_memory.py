@@ -126,3 +126,141 @@ async def test_gpdl_non_hashable_keys():
     assert v1 == v2
     await resource[key].delete()
     assert await resource.get() == []
+
+
+async def test_expire_keys():
+    resource = MemoryResource(key_type=str, value_type=str, expire=0.01)
+    await resource["1"].put("foo")
+    assert await resource.get() == ["1"]
+    sleep(0.01)
+    assert await resource.get() == []
+
+
+async def test_evict_oldest_put_again():
+    resource = MemoryResource(key_type=str, value_type=str, size=2, evict=True)
+    await resource["1"].put("foo")
+    await resource["2"].put("bar")
+    await resource["1"].put("foo")
+    await resource["1"].get()
+    await resource["3"].put("qux")
+    assert await resource.get() == ["1", "3"]
+
+
+async def test_evict_lru():
+    resource = MemoryResource(key_type=str, value_type=str, size=2, evict=True, policy="lru")
+    await resource["1"].put("foo")
+    await resource["2"].put("bar")
+    await resource["1"].get()
+    await resource["3"].put("qux")
+    assert sorted(await resource.get()) == ["1", "3"]
+
+
+async def test_evict_lfu():
+    resource = MemoryResource(key_type=str, value_type=str, size=3, evict=True, policy="lfu")
+    await resource["1"].put("foo")
+    await resource["2"].put("bar")
+    await resource["3"].put("baz")
+    for _ in range(3):
+        await resource["1"].get()
+    await resource["3"].get()
+    await resource["4"].put("qux")  # evicts 2: least frequently used
+    assert sorted(await resource.get()) == ["1", "3", "4"]
+    await resource["5"].put("quux")  # evicts 4: least recently used of least frequent
+    assert sorted(await resource.get()) == ["1", "3", "5"]
+    await resource["3"].delete()
+    await resource["5"].delete()
+    await resource["6"].put("corge")
+    await resource["7"].put("grault")
+    await resource["8"].put("garply")  # evicts 6
+    assert sorted(await resource.get()) == ["1", "7", "8"]
+    assert len(resource._counts) == len(resource._storage)
+
+
+async def test_expire_amortized():
+    resource = MemoryResource(key_type=str, value_type=str, expire=0.01)
+    await resource["1"].put("foo")
+    sleep(0.005)
+    await resource["1"].put("foo")  # stored again; must not be purged with first store
+    sleep(0.006)
+    await resource["2"].put("bar")
+    assert await resource["1"].get() == "foo"
+    assert len(resource._expiry) == 2
+
+
+async def test_max_bytes_evict():
+    resource = MemoryResource(key_type=str, value_type=str, evict=True, max_bytes=10)
+    await resource["1"].put("aaaa")
+    await resource["2"].put("bbbb")
+    assert resource.bytes == 8
+    await resource["3"].put("cccc")  # evicts 1
+    assert await resource.get() == ["2", "3"]
+    await resource["2"].put("bb")  # replaces; fits
+    assert resource.bytes == 6
+    await resource["4"].put("dddddddd")  # evicts 3
+    assert await resource.get() == ["2", "4"]
+    assert resource.bytes == 10
+    with pytest.raises(fondat.error.errors.InsufficientStorageError):
+        await resource["5"].put("x" * 11)
+    await resource["4"].delete()
+    assert resource.bytes == 2
+
+
+async def test_max_bytes_no_evict():
+    resource = MemoryResource(key_type=str, value_type=str, max_bytes=10)
+    await resource["1"].put("aaaaaaaa")
+    with pytest.raises(fondat.error.errors.InsufficientStorageError):
+        await resource["2"].put("bbb")
+    await resource["1"].put("aaaaaaaaaa")  # replacing within budget
+
+
+async def test_max_bytes_sizer():
+    resource = MemoryResource(
+        key_type=str, value_type=list[int], evict=True, max_bytes=3, sizer=len
+    )
+    await resource["1"].put([1, 2])
+    await resource["2"].put([3])
+    await resource["3"].put([4])
+    assert await resource.get() == ["2", "3"]
+    assert resource.bytes == 2
+
+
+async def test_storage_encoded():
+    DC = make_dataclass("DC", [("foo", str), ("bar", int)])
+    resource = MemoryResource(key_type=str, value_type=DC, storage="encoded", max_bytes=100)
+    value = DC(foo="hello", bar=1)
+    await resource["1"].put(value)
+    assert isinstance(resource._storage["1"].value, bytes)
+    assert resource.bytes == len(resource._storage["1"].value)
+    value.bar = 2  # stored value unaffected
+    result = await resource["1"].get()
+    assert result == DC(foo="hello", bar=1)
+    assert result is not await resource["1"].get()
+
+
+async def test_storage_reference():
+    resource = MemoryResource(key_type=str, value_type=list[int], storage="reference")
+    value = [1, 2]
+    await resource["1"].put(value)
+    assert await resource["1"].get() is value
+
+
+async def test_storage_copy():
+    resource = MemoryResource(key_type=str, value_type=list[int])
+    await resource["1"].put([1, 2])
+    result = await resource["1"].get()
+    result.append(3)
+    assert await resource["1"].get() == [1, 2]
+
+
+async def test_value_type_without_codec():
+    class Opaque:
+        pass
+
+    for storage in ("copy", "reference"):
+        resource = MemoryResource(key_type=str, value_type=Opaque, storage=storage)
+        value = Opaque()
+        await resource["1"].put(value)
+        assert isinstance(await resource["1"].get(), Opaque)
+    MemoryResource(key_type=str, value_type=Opaque, max_bytes=10, sizer=lambda v: 1)
+    with pytest.raises(TypeError):
+        MemoryResource(key_type=str, value_type=Opaque, storage="encoded")
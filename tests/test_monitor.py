@@ -69,3 +69,148 @@ async def test_counter_failure():
     assert len(monitor.measurements) == 2
     measurement = monitor.measurements[1]
     assert measurement.tags == {"status": "failure"}
+
+
+async def test_aggregator():
+    downstream = MyMonitor()
+    aggregator = fondat.monitor.Aggregator([downstream])
+    for n in range(3):
+        async with fondat.monitor.counter(
+            name="calls", tags={"op": "a"}, monitor=aggregator, status="status"
+        ):
+            pass
+        await aggregator.record(Measurement(name="level", tags=None, type="gauge", value=n))
+    async with fondat.monitor.counter(name="calls", tags={"op": "b"}, monitor=aggregator):
+        pass
+    assert downstream.measurements == []
+    await aggregator.flush()
+    results = {(m.name, str(m.tags)): m for m in downstream.measurements}
+    assert len(results) == 3
+    assert results[("calls", str({"op": "a", "status": "success"}))].value == 3
+    assert results[("calls", str({"op": "b"}))].value == 1
+    assert results[("level", "None")].type == "gauge"
+    assert results[("level", "None")].value == 2
+    await aggregator.flush()
+    assert len(downstream.measurements) == 3
+
+
+async def test_aggregator_periodic():
+    downstream = MyMonitor()
+    aggregator = fondat.monitor.Aggregator([downstream], interval=0.01)
+    aggregator.start()
+    await aggregator.record(Measurement(name="calls", tags=None, type="counter", value=1))
+    await asyncio.sleep(0.05)
+    assert len(downstream.measurements) == 1
+    await aggregator.record(Measurement(name="calls", tags=None, type="counter", value=1))
+    await aggregator.stop()
+    assert len(downstream.measurements) == 2
+
+
+def test_histogram_quantile():
+    histogram = fondat.monitor.Histogram(accuracy=0.01)
+    for n in range(1, 1001):
+        histogram.add(n / 1000)
+    assert histogram.count == 1000
+    assert histogram.sum == pytest.approx(500.5)
+    for q in (0.5, 0.95, 0.99):
+        assert histogram.quantile(q) == pytest.approx(q, rel=0.02)
+    assert histogram.quantile(0) == pytest.approx(0.001, rel=0.02)
+    assert histogram.quantile(1) == pytest.approx(1.0, rel=0.02)
+    assert fondat.monitor.Histogram().quantile(0.5) is None
+
+
+def test_histogram_merge():
+    a = fondat.monitor.Histogram()
+    b = fondat.monitor.Histogram()
+    for n in range(1, 501):
+        a.add(n)
+        b.add(n + 500)
+    a.merge(b)
+    assert a.count == 1000
+    assert a.max == 1000
+    assert a.quantile(0.5) == pytest.approx(500, rel=0.02)
+    with pytest.raises(ValueError):
+        a.merge(fondat.monitor.Histogram(accuracy=0.05))
+
+
+async def test_timer_histogram():
+    monitor = MyMonitor()
+    async with fondat.monitor.timer(name="baz", monitor=monitor, type="histogram"):
+        pass
+    assert monitor.measurements[0].type == "histogram"
+
+
+async def test_aggregator_histogram():
+    downstream = MyMonitor()
+    aggregator = fondat.monitor.Aggregator([downstream], quantiles=(0.5, 0.99))
+    for n in range(1, 101):
+        await aggregator.record(
+            Measurement(name="duration", tags={"op": "a"}, type="histogram", value=n, unit="s")
+        )
+    await aggregator.flush()
+    results = {(m.name, m.tags.get("quantile")): m for m in downstream.measurements}
+    assert results[("duration_count", None)].value == 100
+    assert results[("duration_count", None)].type == "counter"
+    assert results[("duration_sum", None)].value == 5050
+    assert results[("duration", "0.5")].type == "gauge"
+    assert results[("duration", "0.5")].value == pytest.approx(50, rel=0.02)
+    assert results[("duration", "0.99")].value == pytest.approx(99, rel=0.02)
+    assert results[("duration", "0.99")].tags["op"] == "a"
+
+
+async def test_no_monitors(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("measurement should not be constructed")
+
+    monkeypatch.setattr(fondat.monitor, "Measurement", fail)
+    assert not fondat.monitor.monitors
+    async with fondat.monitor.counter(name="baz", status="status"):
+        async with fondat.monitor.timer(name="baz"):
+            pass
+
+
+async def test_sample_rates(monkeypatch):
+    monitor = MyMonitor()
+    monkeypatch.setitem(fondat.monitor.sample_rates, "sampled", 0.25)
+    monkeypatch.setitem(fondat.monitor.sample_rates, "never", 0.0)
+    for _ in range(400):
+        async with fondat.monitor.counter(name="sampled", monitor=monitor):
+            async with fondat.monitor.timer(name="never", monitor=monitor):
+                pass
+    assert {m.name for m in monitor.measurements} == {"sampled"}
+    assert 20 < len(monitor.measurements) < 200
+    assert all(m.value == 4 for m in monitor.measurements)
+
+
+async def test_loop_monitor():
+    import time
+
+    from fondat.resource import operation, resource
+
+    @resource
+    class Resource:
+        @operation
+        async def get(self) -> None:
+            await asyncio.sleep(0)
+            time.sleep(0.05)  # block the loop
+            await asyncio.sleep(0)
+
+    monitor = MyMonitor()
+    loop_monitor = fondat.monitor.LoopMonitor(interval=0.01, slow=0.04, monitor=monitor)
+    loop_monitor.start()
+    try:
+        await asyncio.sleep(0.02)
+        await asyncio.create_task(Resource().get())
+        await asyncio.sleep(0.03)
+    finally:
+        await loop_monitor.stop()
+    assert asyncio.get_running_loop().get_task_factory() is None
+    measurements = {}
+    for measurement in monitor.measurements:
+        measurements.setdefault(measurement.name, []).append(measurement)
+    assert max(m.value for m in measurements["event_loop_lag"]) >= 0.03
+    assert all(m.value >= 1 for m in measurements["event_loop_tasks"])
+    (slow,) = measurements["event_loop_slow_steps"]
+    assert slow.value == 1
+    assert slow.tags["operation"] == "get"
+    assert slow.tags["resource"].endswith("Resource")
@@ -0,0 +1,61 @@
+import http
+
+from fondat.http import Application, Request
+from fondat.monitor import Measurement
+from fondat.prometheus import MetricsResource, PrometheusMonitor
+
+
+async def test_render():
+    monitor = PrometheusMonitor(quantiles=(0.5,))
+    for _ in range(2):
+        await monitor.record(
+            Measurement(name="calls", tags={"op": "a"}, type="counter", value=1)
+        )
+    await monitor.record(Measurement(name="level", tags=None, type="gauge", value=1.5))
+    await monitor.record(Measurement(name="level", tags=None, type="gauge", value=2.5))
+    await monitor.record(
+        Measurement(name="duration", tags={"op": 'say "hi"'}, type="histogram", value=2)
+    )
+    assert monitor.render().decode().splitlines() == [
+        "# TYPE calls counter",
+        'calls{op="a"} 2',
+        "# TYPE duration summary",
+        'duration{op="say \\"hi\\"",quantile="0.5"} 2',
+        'duration_sum{op="say \\"hi\\""} 2.0',
+        'duration_count{op="say \\"hi\\""} 1',
+        "# TYPE level gauge",
+        "level 2.5",
+    ]
+
+
+async def test_render_cached():
+    monitor = PrometheusMonitor()
+    await monitor.record(Measurement(name="calls", tags=None, type="counter", value=1))
+    rendered = monitor.render()
+    assert monitor.render() is rendered
+    await monitor.record(Measurement(name="calls", tags=None, type="counter", value=1))
+    assert monitor.render() is not rendered
+    assert monitor.render() == b"# TYPE calls counter\ncalls 2\n"
+
+
+async def test_render_changed_only(monkeypatch):
+    monitor = PrometheusMonitor()
+    await monitor.record(Measurement(name="a", tags=None, type="counter", value=1))
+    await monitor.record(Measurement(name="b", tags=None, type="counter", value=1))
+    monitor.render()
+    rendered = []
+    render = monitor._render
+    monkeypatch.setattr(monitor, "_render", lambda name: rendered.append(name) or render(name))
+    await monitor.record(Measurement(name="b", tags=None, type="counter", value=1))
+    assert monitor.render() == b"# TYPE a counter\na 1\n# TYPE b counter\nb 2\n"
+    assert rendered == ["b"]
+
+
+async def test_resource():
+    monitor = PrometheusMonitor()
+    await monitor.record(Measurement(name="calls", tags=None, type="counter", value=1))
+    application = Application(MetricsResource(monitor))
+    response = await application(Request(method="GET", path="/"))
+    assert response.status == http.HTTPStatus.OK.value
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert b"".join([b async for b in response.body]) == b"# TYPE calls counter\ncalls 1\n"
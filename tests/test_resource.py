@@ -1,6 +1,7 @@
 import asyncio
 import fondat.resource
 import pytest
+import time
 
 from dataclasses import dataclass
 from fondat.annotation import Description
@@ -136,3 +137,263 @@ async def test_operation_cache_defaults():
     assert (await r.post()) == 3
     assert (await r.post("foo")) == 3
     assert (await r.post("bar")) == 4
+
+
+async def test_operation_context_arguments():
+    import fondat.context as context
+
+    @resource
+    class Resource:
+        @operation
+        async def get(self, a: int, b: str = "x") -> dict:
+            return context.last(context="fondat.operation")
+
+    value = await Resource().get(1, b="y")
+    assert value["arguments"] == {"a": 1, "b": "y"}
+    assert value["resource"].endswith("Resource")
+    assert value["operation"] == "get"
+
+
+async def test_operation_cache_single_flight():
+    cache = MemoryResource(key_type=Any, value_type=Any)
+
+    @resource
+    class Resource:
+        def __init__(self):
+            self.counter = 0
+
+        @operation(cache=cache)
+        async def get(self, s: str = "foo") -> int:
+            self.counter += 1
+            result = self.counter
+            await asyncio.sleep(0.01)
+            return result
+
+    r = Resource()
+    results = await asyncio.gather(*(r.get() for _ in range(10)), r.get("bar"))
+    assert results == [1] * 10 + [2]
+    assert r.counter == 2
+
+
+async def test_operation_cache_single_flight_exception():
+    cache = MemoryResource(key_type=Any, value_type=Any)
+
+    @resource
+    class Resource:
+        def __init__(self):
+            self.counter = 0
+
+        @operation(cache=cache)
+        async def get(self) -> int:
+            self.counter += 1
+            await asyncio.sleep(0.01)
+            raise BadRequestError
+
+    r = Resource()
+    results = await asyncio.gather(*(r.get() for _ in range(5)), return_exceptions=True)
+    assert all(isinstance(result, BadRequestError) for result in results)
+    assert r.counter == 1
+    with pytest.raises(BadRequestError):
+        await r.get()
+    assert r.counter == 2
+
+
+async def test_operation_cache_refresh():
+    cache = MemoryResource(key_type=Any, value_type=Any)
+
+    @resource
+    class Resource:
+        def __init__(self):
+            self.counter = 0
+
+        @operation(cache=cache, cache_refresh=0.05)
+        async def get(self) -> int:
+            self.counter += 1
+            return self.counter
+
+    r = Resource()
+    assert await r.get() == 1
+    assert await r.get() == 1
+    await asyncio.sleep(0.05)
+    assert await r.get() == 1  # stale result returned, refresh in background
+    await asyncio.sleep(0.01)
+    assert await r.get() == 2
+
+
+async def test_operation_cache_malformed():
+    cache = MemoryResource(key_type=Any, value_type=Any)
+
+    @resource
+    class Resource:
+        def __init__(self):
+            self.counter = 0
+
+        @operation(cache=cache)
+        async def get(self) -> int:
+            self.counter += 1
+            return self.counter
+
+    r = Resource()
+    assert await r.get() == 1
+    (key,) = cache._storage
+    for value in (2, {"result": 2}, {"result": "x", "time": time.time()}):
+        cache._write(key, value)  # e.g. stored in a previous format
+        assert await r.get() == r.counter  # a miss
+    assert r.counter == 4
+    assert await r.get() == 4  # cached again
+
+
+async def test_operation_cache_expire():
+    cache = MemoryResource(key_type=Any, value_type=Any)
+
+    @resource
+    class Resource:
+        def __init__(self):
+            self.counter = 0
+
+        @operation(cache=cache, cache_refresh=0.01, cache_expire=0.05)
+        async def get(self) -> int:
+            self.counter += 1
+            return self.counter
+
+    r = Resource()
+    assert await r.get() == 1
+    await asyncio.sleep(0.05)
+    assert await r.get() == 2  # expired result not returned
+
+
+def test_operation_cache_refresh_requires_cache():
+    with pytest.raises(TypeError):
+
+        @resource
+        class Resource:
+            @operation(cache_refresh=1)
+            async def get(self) -> int:
+                return 1
+
+
+async def test_operation_cache_tags():
+    cache = MemoryResource(key_type=Any, value_type=Any)
+
+    @resource
+    class Resource:
+        def __init__(self):
+            self.values = {"a": 1, "b": 1}
+
+        @query(cache=cache, cache_tags=lambda self, key: [f"value:{key}"])
+        async def value(self, key: str) -> int:
+            return self.values[key]
+
+        @mutation(invalidates=lambda self, key, value: [f"value:{key}"])
+        async def set_value(self, key: str, value: int) -> None:
+            self.values[key] = value
+
+    r = Resource()
+    assert await r.value("a") == 1
+    assert await r.value("b") == 1
+    r.values["a"] = 2
+    r.values["b"] = 2
+    assert await r.value("a") == 1  # cached
+    await r.set_value("a", 3)
+    assert await r.value("a") == 3  # invalidated
+    assert await r.value("b") == 1  # not invalidated
+
+
+async def test_tags_in_cache():
+    from fondat.cache import Tags
+
+    tags = Tags(cache=MemoryResource(key_type=Any, value_type=str))
+    versions = await tags.versions(["x", "y"])
+    assert await tags.valid(versions)
+    await tags.invalidate(["y", "z"])
+    assert not await tags.valid(versions)
+    assert await tags.valid({"x": versions["x"]})
+
+
+async def test_tags_untracked_valid():
+    from fondat.cache import Tags
+
+    tags = Tags(size=3)
+    versions = [await tags.versions([f"row{n}"]) for n in range(6)]
+    for v in versions:
+        assert await tags.valid(v)  # never invalidated; not bounded by size
+    assert await Tags().valid(versions[0])  # e.g. after restart
+    assert not tags._invalidated
+
+
+async def test_tags_previous_format_invalid():
+    from fondat.cache import Tags
+
+    assert not await Tags().valid({"x": "0123456789abcdef"})
+
+
+async def test_tags_size_slots():
+    from fondat.cache import Tags
+
+    tags = Tags(size=1)
+    before = await tags.versions(["a", "x"])
+    await tags.invalidate(["a"])
+    after = await tags.versions(["a", "x"])
+    assert len(tags._invalidated) == 1
+    assert not await tags.valid({"a": before["a"]})
+    assert not await tags.valid({"x": before["x"]})  # shares slot with "a"
+    assert await tags.valid(after)
+
+
+async def test_operation_memoize():
+    import fondat.context as context
+
+    @resource
+    class Resource:
+        def __init__(self):
+            self.counter = 0
+
+        @query(memoize=True)
+        async def value(self, key: str) -> list[int]:
+            self.counter += 1
+            result = [self.counter]
+            await asyncio.sleep(0.01)
+            return result
+
+    r = Resource()
+    assert await r.value("a") == [1]  # no memo scope
+    with context.memo_scope():
+        results = await asyncio.gather(r.value("a"), r.value("a"), r.value("b"))
+        assert results == [[2], [2], [3]]
+        result = await r.value("a")
+        assert result == [2]
+        result.append(0)  # copies are returned
+        assert await r.value("a") == [2]
+    with context.memo_scope():
+        assert await r.value("a") == [4]
+    assert r.counter == 4
+
+
+async def test_operation_memoize_instances():
+    import fondat.context as context
+
+    @resource
+    class Item:
+        def __init__(self, id: int):
+            self.id = id
+
+        @query(memoize=True)
+        async def get(self) -> int:
+            return self.id
+
+    with context.memo_scope():
+        assert await Item(1).get() == 1
+        assert await Item(2).get() == 2  # may be allocated where Item(1) was
+        item = Item(3)
+        assert await item.get() == 3
+        assert await item.get() == 3
+
+
+def test_operation_memoize_mutation():
+    with pytest.raises(TypeError):
+
+        @resource
+        class Resource:
+            @mutation(memoize=True)
+            async def foo(self) -> int:
+                return 1
@@ -86,3 +86,79 @@ async def test_security_forbidden():
 async def test_security_forbidden_wins():
     with pytest.raises(ForbiddenError):
         await R1().forbidden_wins()
+
+
+async def test_policy_principal_memo_scope():
+    import fondat.context as context
+
+    calls = []
+
+    async def rule():
+        calls.append(context.last(context="principal")["id"])
+        if context.last(context="principal")["id"] == "bad":
+            raise ForbiddenError
+
+    policy = Policy(rules=[rule], principal=lambda: context.last(context="principal")["id"])
+    with context.memo_scope():
+        with context.push(context="principal", id="good"):
+            await policy.apply()
+            await policy.apply()
+        with context.push(context="principal", id="bad"):
+            for _ in range(2):
+                with pytest.raises(ForbiddenError):
+                    await policy.apply()
+    with context.push(context="principal", id="good"):
+        await policy.apply()  # no memo scope, no expiry; evaluated
+    assert calls == ["good", "bad", "good"]
+
+
+async def test_policy_principal_expire():
+    import asyncio
+
+    calls = []
+
+    async def rule():
+        calls.append(1)
+
+    policy = Policy(rules=[rule], principal=lambda: "user", expire=0.05)
+    await policy.apply()
+    await policy.apply()
+    assert len(calls) == 1
+    await asyncio.sleep(0.05)
+    await policy.apply()
+    assert len(calls) == 2
+
+
+async def test_policy_cached_denial_new_instance():
+    async def rule():
+        raise ForbiddenError("nope")
+
+    policy = Policy(rules=[rule], principal=lambda: "user", expire=10)
+    raised = []
+    for _ in range(3):
+        with pytest.raises(ForbiddenError) as info:
+            await policy.apply()
+        raised.append(info.value)
+    assert len({id(e) for e in raised}) == 3
+    assert all(e.args == ("nope",) for e in raised)
+
+
+async def test_policy_concurrent():
+    import asyncio
+
+    cancelled = []
+
+    async def slow_rule():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def quick_rule():
+        await asyncio.sleep(0.01)
+
+    await Policy(rules=[quick_rule, quick_rule], concurrent=True).apply()
+    with pytest.raises(ForbiddenError):
+        await Policy(rules=[slow_rule, quick_rule, forbidden_rule], concurrent=True).apply()
+    assert cancelled == [True]
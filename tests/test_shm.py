@@ -0,0 +1,93 @@
+import asyncio
+import concurrent.futures
+import fondat.error
+import multiprocessing
+import pytest
+import tempfile
+
+from fondat.cache import CacheResource, EntryResource
+from fondat.error import NotFoundError
+from fondat.shm import SharedMemoryCache
+from time import sleep
+
+
+@pytest.fixture
+def path():
+    with tempfile.TemporaryDirectory() as dir:
+        yield f"{dir}/cache"
+
+
+async def test_gpd(path):
+    cache = SharedMemoryCache(path, slots=16, slot_size=256)
+    assert isinstance(cache, CacheResource)
+    entry = cache[{"a": 1}]
+    assert isinstance(entry, EntryResource)
+    with pytest.raises(NotFoundError):
+        await entry.get()
+    await entry.put({"result": [1, 2, 3]})
+    assert await cache[{"a": 1}].get() == {"result": [1, 2, 3]}
+    await entry.put("replaced")
+    assert await entry.get() == "replaced"
+    await entry.delete()
+    with pytest.raises(NotFoundError):
+        await entry.get()
+    with pytest.raises(NotFoundError):
+        await entry.delete()
+    await cache[b"bytes"].put(1)
+    assert await cache[b"bytes"].get() == 1
+    cache.close()
+
+
+async def test_too_large(path):
+    cache = SharedMemoryCache(path, slots=4, slot_size=64)
+    with pytest.raises(fondat.error.errors.InsufficientStorageError):
+        await cache["key"].put("x" * 64)
+
+
+async def test_expire(path):
+    cache = SharedMemoryCache(path, slots=4, slot_size=64, expire=0.01)
+    await cache["key"].put("value")
+    assert await cache["key"].get() == "value"
+    sleep(0.01)
+    with pytest.raises(NotFoundError):
+        await cache["key"].get()
+
+
+async def test_evict_oldest(path):
+    cache = SharedMemoryCache(path, slots=4, slot_size=64, probe=4)
+    for n in range(5):
+        await cache[n].put(n)
+    with pytest.raises(NotFoundError):
+        await cache[0].get()  # oldest evicted
+    for n in range(1, 5):
+        assert await cache[n].get() == n
+    await cache.clear()
+    for n in range(1, 5):
+        with pytest.raises(NotFoundError):
+            await cache[n].get()
+
+
+async def test_reinitialize_incompatible(path):
+    await SharedMemoryCache(path, slots=4, slot_size=64)["key"].put("value")
+    cache = SharedMemoryCache(path, slots=8, slot_size=64)
+    with pytest.raises(NotFoundError):
+        await cache["key"].get()
+
+
+def _put(path, n):
+    async def put():
+        await SharedMemoryCache(path, slots=64, slot_size=128)[n].put(n * 10)
+
+    asyncio.run(put())
+
+
+async def test_processes(path):
+    cache = SharedMemoryCache(path, slots=64, slot_size=128)
+    await cache["parent"].put("value")  # opened before fork
+    context = multiprocessing.get_context("fork")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2, mp_context=context) as pool:
+        for future in [pool.submit(_put, path, n) for n in range(4)]:
+            future.result()
+    for n in range(4):
+        assert await cache[n].get() == n * 10
+    assert await cache["parent"].get() == "value"
@@ -1,5 +1,6 @@
 import asyncio
 import contextlib
+import fondat.cache
 import fondat.error
 import fondat.patch
 import fondat.sql as sql
@@ -405,6 +406,141 @@ async def test_get_cache_evict(table: sqlite.Table):
     assert await sql.RowResource(table, key2, cache).get() == row2  # still cached
 
 
+async def test_row_tag_invalidate_cache(table: sqlite.Table):
+    cache = MemoryResource(key_type=bytes, value_type=Any, size=10, expire=10, evict=True)
+    key = uuid4()
+    row = DC(key=key, str_=str(key))
+    await sql.RowResource(table, key, cache).put(row)  # caches row
+    async with table.database.transaction():
+        await table.delete(key)
+    assert await sql.RowResource(table, key, cache).get() == row  # still cached
+    await fondat.cache.tags.invalidate([sql.row_tag(table, key)])
+    with pytest.raises(fondat.error.NotFoundError):
+        await sql.RowResource(table, key, cache).get()
+
+
+async def test_row_cache_not_bounded_by_tags(table: sqlite.Table, monkeypatch):
+    monkeypatch.setattr(fondat.cache, "tags", fondat.cache.Tags(size=3))
+    cache = MemoryResource(key_type=bytes, value_type=Any)
+    keys = [uuid4() for _ in range(6)]
+    async with table.database.transaction():
+        for key in keys:
+            await table.insert(DC(key=key, str_=str(key)))
+    for key in keys:
+        await sql.RowResource(table, key, cache).get()  # caches row
+    async with table.database.transaction():
+        for key in keys:
+            await table.delete(key)
+    for key in keys:
+        assert await sql.RowResource(table, key, cache).get() == DC(key=key, str_=str(key))
+
+
+async def test_row_cache_malformed(table: sqlite.Table):
+    cache = MemoryResource(key_type=bytes, value_type=Any)
+    key = uuid4()
+    row = DC(key=key, str_="a")
+    await sql.RowResource(table, key, cache).put(row)
+    (entry,) = cache._storage
+    for value in ({"key": str(key), "str_": "a"}, {"row": 1, "tags": {}}, "x"):
+        cache._write(entry, value)  # e.g. stored in a previous format
+        assert await sql.RowResource(table, key, cache).get() == row
+
+
+async def test_row_mutation_invalidates_tags(table: sqlite.Table):
+    key = uuid4()
+    versions = await fondat.cache.tags.versions([sql.table_tag(table), sql.row_tag(table, key)])
+    await sql.RowResource(table, key).put(DC(key=key, str_="a"))
+    for tag, version in versions.items():
+        assert not await fondat.cache.tags.valid({tag: version})
+
+
+async def test_patch_invalidates_after_commit(table: sqlite.Table, monkeypatch):
+    calls = []
+    invalidate = fondat.cache.tags.invalidate
+
+    async def recording_invalidate(tags):
+        tags = set(tags)
+        calls.append((tags, table.database._txn.get()))
+        await invalidate(tags)
+
+    monkeypatch.setattr(fondat.cache.tags, "invalidate", recording_invalidate)
+    key1, key2 = uuid4(), uuid4()
+    async with table.database.transaction():
+        await table.insert(DC(key=key1, str_="a"))
+    await sql.RowResource(table, key1).patch({"str_": "b"})
+    assert calls == [({sql.table_tag(table), sql.row_tag(table, key1)}, None)]
+    calls.clear()
+    await sql.TableResource(table).patch(
+        [{"key": str(key1), "str_": "c"}, {"key": str(key2), "str_": "d"}]
+    )
+    tags = {sql.table_tag(table), sql.row_tag(table, key1), sql.row_tag(table, key2)}
+    assert calls == [(tags, None)]
+
+
+async def test_row_loader(table: sqlite.Table):
+    rows = [DC(key=uuid4(), str_=str(n)) for n in range(10)]
+    async with table.database.transaction():
+        for row in rows:
+            await table.insert(row)
+    resource = sql.TableResource(table, loader=sql.RowLoader(table))
+    execute = table.database.execute
+    statements = []
+
+    async def counting_execute(statement, result=None):
+        statements.append(statement)
+        return await execute(statement, result)
+
+    table.database.execute = counting_execute
+    try:
+        missing = uuid4()
+        results = await asyncio.gather(
+            *(resource[row.key].get() for row in rows),
+            resource[rows[0].key].exists(),
+            resource[missing].exists(),
+            resource[missing].get(),
+            return_exceptions=True,
+        )
+    finally:
+        del table.database.execute
+    assert results[:10] == rows
+    assert results[10] is True
+    assert results[11] is False
+    assert isinstance(results[12], fondat.error.NotFoundError)
+    assert len([s for s in statements if str(s).startswith("SELECT")]) == 1
+
+
+async def test_row_loader_caller_deadline(table: sqlite.Table):
+    import fondat.deadline
+
+    row = DC(key=uuid4(), str_="a")
+    async with table.database.transaction():
+        await table.insert(row)
+    loader = sql.RowLoader(table)
+
+    async def expired():
+        with fondat.deadline.push(0):
+            return await loader.load(row.key)
+
+    results = await asyncio.gather(expired(), loader.load(row.key))
+    assert results == [row, row]  # batch query not subject to first caller's deadline
+
+
+async def test_row_loader_fetch_cancelled(table: sqlite.Table):
+    async def select(**kwargs):
+        await asyncio.Event().wait()
+        yield
+
+    table.select = select
+    loader = sql.RowLoader(table)
+    load = asyncio.create_task(loader.load(uuid4()))
+    while not loader._tasks:
+        await asyncio.sleep(0)
+    for task in loader._tasks:
+        task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(load, 1)  # waiter does not hang
+
+
 async def test_exists_no_cache(table):
     key = uuid4()
     resource = sql.RowResource(table, key)
@@ -620,3 +756,148 @@ async def test_patch_multi(database, table):
             row = await resource[key].get()
             assert row.str_ == "c"
         assert await resource.table.count() == 20
+
+
+async def test_execute_deadline(database):
+    import fondat.deadline
+
+    async with database.transaction():
+        with fondat.deadline.push(0):
+            with pytest.raises(fondat.error.errors.GatewayTimeoutError):
+                await database.execute(Expression("SELECT 1;"))
+
+
+async def test_execute_operation_timeout(database):
+    import time
+
+    from fondat.resource import operation, resource
+
+    @resource
+    class Resource:
+        @operation(timeout=0.2)
+        async def get(self) -> int:
+            async with database.transaction():
+                await database.execute(
+                    Expression(
+                        "WITH RECURSIVE c(x) AS ",
+                        "(SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 10000000) ",
+                        "SELECT max(x) FROM c;",
+                    )
+                )
+            return 0
+
+    start = time.monotonic()
+    with pytest.raises(fondat.error.errors.GatewayTimeoutError):
+        await Resource().get()
+    assert time.monotonic() - start < 1  # statement interrupted on cancellation
+
+
+async def test_cache_gpd(database):
+    cache = sqlite.SQLiteCache(database)
+    await cache.create()
+    await cache.create()  # idempotent
+    assert isinstance(cache, fondat.cache.CacheResource)
+    entry = cache[{"a": 1}]
+    with pytest.raises(fondat.error.NotFoundError):
+        await entry.get()
+    await entry.put({"result": [1, 2]})
+    assert await cache[{"a": 1}].get() == {"result": [1, 2]}
+    await entry.put("replaced")
+    assert await entry.get() == "replaced"
+    await entry.delete()
+    with pytest.raises(fondat.error.NotFoundError):
+        await entry.delete()
+    await cache[b"bytes"].put(1)
+    assert await cache[b"bytes"].get() == 1
+    await cache.clear()
+    assert await cache.count() == 0
+
+
+async def test_cache_persists(database):
+    cache = sqlite.SQLiteCache(database)
+    await cache.create()
+    await cache["key"].put("value")
+    cache = sqlite.SQLiteCache(sqlite.Database(database.path))
+    assert await cache["key"].get() == "value"
+    async with database.connection():
+        mode = await database._conn.get().execute("PRAGMA journal_mode;")
+        assert (await mode.fetchone())[0] == "wal"
+
+
+async def test_cache_rows_persist(table: sqlite.Table, monkeypatch):
+    cache = sqlite.SQLiteCache(table.database)
+    await cache.create()
+    resource = sql.TableResource(table, cache=cache)
+    key = uuid4()
+    row = DC(key=key, str_="a")
+    await resource[key].put(row)
+    async with table.database.transaction():
+        await table.delete(key)
+    monkeypatch.setattr(fondat.cache, "tags", fondat.cache.Tags())  # simulate restart
+    cache = sqlite.SQLiteCache(sqlite.Database(table.database.path))
+    assert await sql.TableResource(table, cache=cache)[key].get() == row  # cached
+
+
+async def test_cache_rows_persist_invalidation(table: sqlite.Table, monkeypatch):
+    tags = sqlite.SQLiteCache(table.database, table="tags")
+    await tags.create()
+    monkeypatch.setattr(fondat.cache, "tags", fondat.cache.Tags(cache=tags))
+    cache = sqlite.SQLiteCache(table.database)
+    await cache.create()
+    key = uuid4()
+    row = DC(key=key, str_="a")
+    await sql.RowResource(table, key, cache).put(row)
+    async with table.database.transaction():
+        await table.delete(key)
+    await fondat.cache.tags.invalidate([sql.row_tag(table, key)])
+    monkeypatch.setattr(fondat.cache, "tags", fondat.cache.Tags(cache=tags))  # restart
+    with pytest.raises(fondat.error.NotFoundError):  # not cached; not in table
+        await sql.RowResource(table, key, cache).get()
+
+
+async def test_cache_expire(database):
+    cache = sqlite.SQLiteCache(database, expire=0.01, cleanup=3)
+    await cache.create()
+    await cache["1"].put(1)
+    await cache["2"].put(2)
+    await asyncio.sleep(0.01)
+    with pytest.raises(fondat.error.NotFoundError):
+        await cache["1"].get()
+    assert await cache.count() == 2  # not yet cleaned up
+    await cache["3"].put(3)  # cleanup
+    assert await cache.count() == 1
+
+
+async def test_cache_size_lru(database):
+    cache = sqlite.SQLiteCache(database, size=2, cleanup=100)
+    await cache.create()
+    for n in range(3):
+        await cache[n].put(n)
+        await asyncio.sleep(0.001)
+    await cache[0].get()  # 1 is now least recently used
+    await cache.clean()
+    assert await cache.count() == 2
+    assert await cache[0].get() == 0
+    assert await cache[2].get() == 2
+    with pytest.raises(fondat.error.NotFoundError):
+        await cache[1].get()
+
+
+async def test_cache_operation(database):
+    from fondat.resource import operation, resource
+
+    cache = sqlite.SQLiteCache(database)
+    await cache.create()
+    calls = 0
+
+    @resource
+    class Resource:
+        @operation(cache=cache)
+        async def get(self, n: int) -> int:
+            nonlocal calls
+            calls += 1
+            return n * 2
+
+    assert await Resource().get(2) == 4
+    assert await Resource().get(2) == 4
+    assert calls == 1
@@ -0,0 +1,130 @@
+import asyncio
+import fondat.deadline
+import fondat.sqlite
+import pytest
+import tempfile
+
+from fondat.cache import CacheResource
+from fondat.error import NotFoundError
+from fondat.memory import MemoryResource
+from fondat.resource import operation, resource
+from fondat.tiered import TieredCache
+from typing import Any
+
+
+def memory(**kwargs):
+    return MemoryResource(key_type=Any, value_type=Any, **kwargs)
+
+
+async def test_tiered_through_promote():
+    l1, l2 = memory(), memory()
+    cache = TieredCache(l1, l2)
+    assert isinstance(cache, CacheResource)
+    await cache["a"].put(1)
+    assert await l1["a"].get() == 1
+    assert await l2["a"].get() == 1
+    await l1["a"].delete()
+    assert await cache["a"].get() == 1  # from l2
+    assert await l1["a"].get() == 1  # promoted
+    await cache["a"].delete()
+    for tier in (l1, l2):
+        with pytest.raises(NotFoundError):
+            await tier["a"].get()
+    with pytest.raises(NotFoundError):
+        await cache["a"].get()
+    with pytest.raises(NotFoundError):
+        await cache["a"].delete()
+
+
+async def test_tiered_no_promote():
+    l1, l2 = memory(), memory()
+    cache = TieredCache(l1, l2, promote=False)
+    await l2["a"].put(1)
+    assert await cache["a"].get() == 1
+    with pytest.raises(NotFoundError):
+        await l1["a"].get()
+
+
+async def test_tiered_promote_failure():
+    l1, l2 = memory(size=1), memory()
+    cache = TieredCache(l1, l2)
+    await l1["x"].put(0)  # l1 full, no eviction
+    await l2["a"].put(1)
+    assert await cache["a"].get() == 1
+
+
+async def test_tiered_behind():
+    l1, l2 = memory(), memory()
+    cache = TieredCache(l1, l2, write="behind")
+    for n in range(3):
+        await cache["a"].put(n)
+    await cache["b"].put("b")
+    await l1["a"].delete()
+    assert await cache["a"].get() == 2  # pending write
+    await cache.flush()
+    assert await l2["a"].get() == 2
+    assert await l2["b"].get() == "b"
+    await cache["c"].put("c")
+    await cache["c"].delete()
+    await cache.flush()
+    with pytest.raises(NotFoundError):
+        await l2["c"].get()
+
+
+@resource
+class SlowCache:
+    def __init__(self):
+        self.memory = memory()
+
+    @resource
+    class EntryResource:
+        def __init__(self, entry):
+            self.entry = entry
+
+        @operation
+        async def get(self) -> Any:
+            return await self.entry.get()
+
+        @operation
+        async def put(self, value: Any) -> None:
+            await asyncio.sleep(0.05)
+            await self.entry.put(value)
+
+        @operation
+        async def delete(self) -> None:
+            await self.entry.delete()
+
+    def __getitem__(self, key):
+        return self.EntryResource(self.memory[key])
+
+
+async def test_tiered_behind_caller_deadline():
+    l2 = SlowCache()
+    cache = TieredCache(memory(), l2, write="behind")
+    with fondat.deadline.push(0.01):
+        await cache["a"].put(1)
+    await cache["b"].put(2)
+    await cache.flush()
+    assert await l2.memory["a"].get() == 1
+    assert await l2.memory["b"].get() == 2
+
+
+async def test_tiered_operation_sqlite():
+    with tempfile.TemporaryDirectory() as dir:
+        l2 = fondat.sqlite.SQLiteCache(fondat.sqlite.Database(f"{dir}/cache.db"))
+        await l2.create()
+        cache = TieredCache(memory(size=10, evict=True), l2)
+        calls = 0
+
+        @resource
+        class Resource:
+            @operation(cache=cache)
+            async def get(self, n: int) -> int:
+                nonlocal calls
+                calls += 1
+                return n
+
+        assert await Resource().get(1) == 1
+        await cache.l1.clear()
+        assert await Resource().get(1) == 1
+        assert calls == 1
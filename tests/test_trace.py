@@ -0,0 +1,130 @@
+import fondat.sqlite
+import fondat.trace
+import json
+import pytest
+import tempfile
+
+from dataclasses import make_dataclass
+from fondat.http import Application, Request
+from fondat.resource import operation, resource
+from fondat.stream import BytesStream, Reader
+from fondat.trace import FileExporter, MemoryExporter
+
+
+@pytest.fixture
+def exporter():
+    exporter = MemoryExporter()
+    fondat.trace.exporters.append(exporter)
+    yield exporter
+    fondat.trace.exporters.remove(exporter)
+
+
+async def test_no_exporters():
+    with fondat.trace.span("foo") as span:
+        assert span is None
+        assert fondat.trace.current() is None
+    assert fondat.trace._buffer == []
+
+
+async def test_nested(exporter):
+    with fondat.trace.span("outer", a="b") as outer:
+        assert fondat.trace.current() is outer
+        with fondat.trace.span("inner") as inner:
+            pass
+        with pytest.raises(ValueError):
+            with fondat.trace.span("failed"):
+                raise ValueError("bad")
+    await fondat.trace.flush()
+    spans = {span.name: span for span in exporter.spans}
+    assert list(spans) == ["inner", "failed", "outer"]
+    assert spans["outer"].parent_id is None
+    assert spans["outer"].tags == {"a": "b"}
+    assert spans["inner"].parent_id == outer.span_id
+    assert spans["inner"].trace_id == outer.trace_id
+    assert spans["inner"].status == "ok"
+    assert spans["failed"].status == "error"
+    assert spans["failed"].error == "ValueError: bad"
+    assert outer.start <= inner.start <= inner.end <= outer.end
+
+
+async def test_periodic_flush(exporter, monkeypatch):
+    import asyncio
+
+    monkeypatch.setattr(fondat.trace, "flush_interval", 0.01)
+    fondat.trace.start()
+    try:
+        with fondat.trace.span("foo"):
+            pass
+        await asyncio.sleep(0.05)
+        assert [span.name for span in exporter.spans] == ["foo"]
+        with fondat.trace.span("bar"):
+            pass
+    finally:
+        await fondat.trace.stop()
+    assert [span.name for span in exporter.spans] == ["foo", "bar"]
+    assert fondat.trace._flusher is None
+
+
+async def test_batch(exporter, monkeypatch):
+    monkeypatch.setattr(fondat.trace, "batch_size", 3)
+    for _ in range(2):
+        with fondat.trace.span("foo"):
+            pass
+    assert len(exporter.spans) == 0
+    with fondat.trace.span("foo"):
+        pass
+    await next(iter(fondat.trace._exports))
+    assert len(exporter.spans) == 3
+
+
+async def test_file_exporter():
+    with tempfile.NamedTemporaryFile(suffix=".jsonl") as file:
+        exporter = FileExporter(file.name)
+        fondat.trace.exporters.append(exporter)
+        try:
+            with fondat.trace.span("foo", a=1):
+                pass
+            await fondat.trace.flush()
+        finally:
+            fondat.trace.exporters.remove(exporter)
+        lines = [json.loads(line) for line in open(file.name)]
+    assert len(lines) == 1
+    assert lines[0]["name"] == "foo"
+    assert lines[0]["tags"] == {"a": 1}
+    assert lines[0]["status"] == "ok"
+
+
+async def test_http_operation_sql(exporter):
+    DC = make_dataclass("DC", [("key", int), ("value", str)])
+    with tempfile.TemporaryDirectory() as dir:
+        database = fondat.sqlite.Database(f"{dir}/test.db")
+        table = fondat.sqlite.Table("test", database, DC, "key")
+        async with database.transaction():
+            await table.create()
+
+        @resource
+        class Resource:
+            @operation
+            async def get(self) -> int:
+                async with database.transaction():
+                    return await table.count()
+
+        response = await Application(Resource())(Request(method="GET", path="/"))
+    await fondat.trace.flush()
+    spans = {span.name: span for span in exporter.spans}
+    assert spans["http.request"].tags["status"] == response.status
+    operation_span = next(s for s in exporter.spans if s.tags.get("operation") == "get")
+    assert operation_span.name.endswith("Resource.get")
+    assert operation_span.parent_id == spans["http.request"].span_id
+    assert spans["sql.execute"].trace_id == operation_span.trace_id
+    assert "SELECT" in spans["sql.execute"].tags["statement"]
+
+
+async def test_stream_read(exporter):
+    with fondat.trace.span("outer") as outer:
+        assert await Reader(BytesStream(b"abc")).read() == b"abc"
+    await fondat.trace.flush()
+    reads = [span for span in exporter.spans if span.name == "stream.read"]
+    assert reads
+    assert all(span.parent_id == outer.span_id for span in reads)
+    assert all(span.status == "ok" for span in reads)  # including read of end of stream